@@ -7,6 +7,7 @@ import sys
 import bcrypt
 from sqlalchemy.orm import Session
 
+from app.config import settings
 from app.database import SessionLocal
 from app.models.user import User
 
@@ -36,7 +37,7 @@ def create_admin(email: str, password: str | None = None) -> None:
 
         # Create admin user
         password_hash = bcrypt.hashpw(
-            password.encode("utf-8"), bcrypt.gensalt()
+            password.encode("utf-8"), bcrypt.gensalt(rounds=settings.bcrypt_rounds)
         ).decode("utf-8")
         user = User(email=email.lower(), password_hash=password_hash, is_admin=True)
         db.add(user)
@@ -1,3 +1,4 @@
+from pydantic import Field, model_validator
 from pydantic_settings import BaseSettings
 
 
@@ -31,6 +32,19 @@ class Settings(BaseSettings):
     session_cookie_name: str = "bloaty_session"
     session_max_age: int = 86400 * 7  # 7 days
     session_cookie_secure: bool = False  # True in production
+    # Password hashing cost (2^rounds iterations); bcrypt accepts 4-31
+    bcrypt_rounds: int = Field(12, ge=4, le=31)
+    # Allow bcrypt_rounds below 10 (only for throwaway dev/test databases)
+    bcrypt_allow_weak_rounds: bool = False
+
+    @model_validator(mode="after")
+    def check_bcrypt_rounds(self) -> "Settings":
+        if self.bcrypt_rounds < 10 and not self.bcrypt_allow_weak_rounds:
+            raise ValueError(
+                f"bcrypt_rounds={self.bcrypt_rounds} is too weak for real "
+                "passwords; set BCRYPT_ALLOW_WEAK_ROUNDS=1 to allow it"
+            )
+        return self
 
     class Config:
         env_file = ".env"
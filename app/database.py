@@ -4,7 +4,17 @@ from sqlalchemy.orm import sessionmaker
 
 from app.config import settings
 
-engine = create_engine(settings.database_url)
+try:
+    import orjson
+except ImportError:  # comes with fastapi[all], but is not a direct dependency
+    orjson = None
+
+# JSON/JSONB columns (eval results, AI responses) are decoded with orjson when
+# it is installed; it parses large documents several times faster
+engine = create_engine(
+    settings.database_url,
+    json_deserializer=orjson.loads if orjson is not None else None,
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
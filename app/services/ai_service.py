@@ -153,6 +153,10 @@ class ClaudeService:
         self.haiku_model = settings.haiku_model
         self.sonnet_model = settings.sonnet_model
 
+    def close(self) -> None:
+        """Close the client's pooled HTTP connections (for short-lived scripts)."""
+        self.client.close()
+
     # =========================================================================
     # SCHEMA VALIDATION + CONVERSATIONAL RETRY
     # =========================================================================
@@ -375,8 +379,8 @@ class ClaudeService:
             ValueError: Invalid response or request error
         """
         try:
-            # Read and encode image
-            image_data = self._load_image_base64(image_path)
+            # Read and encode image (off the event loop, like the API call)
+            image_data = await asyncio.to_thread(self._load_image_base64, image_path)
             media_type = self._get_media_type(image_path)
 
             # Build user message with optional notes
@@ -402,7 +406,10 @@ class ClaudeService:
 
             messages = [{"role": "user", "content": user_message}]
 
-            validated, raw_text, _response = self._call_with_schema_retry(
+            # The client is synchronous, so run the call in a worker thread
+            # rather than blocking the event loop for the whole request
+            validated, raw_text, _response = await asyncio.to_thread(
+                self._call_with_schema_retry,
                 messages=messages,
                 schema_class=MealAnalysisSchema,
                 request_params={
@@ -26,7 +26,9 @@ class LocalAuthProvider(AuthProvider):
 
     def _hash_password(self, password: str) -> str:
         """Hash a password using bcrypt."""
-        return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+        return bcrypt.hashpw(
+            password.encode("utf-8"), bcrypt.gensalt(rounds=settings.bcrypt_rounds)
+        ).decode("utf-8")
 
     def _verify_password(self, plain_password: str, hashed_password: str) -> bool:
         """Verify a password against its hash."""
@@ -6,6 +6,8 @@ from typing import Dict, List, Optional, Tuple
 from uuid import UUID
 from zoneinfo import ZoneInfo
 
+from sqlalchemy import insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 
@@ -203,6 +205,72 @@ class MealService:
         db.refresh(meal_ingredient)
         return meal_ingredient
 
+    @staticmethod
+    def add_ingredients_bulk(db: Session, meal_id: int, rows: List[dict]) -> int:
+        """
+        Add several ingredients to a meal with a fixed number of statements.
+
+        Missing ingredients are created with one INSERT ... ON CONFLICT DO
+        NOTHING (so concurrent creators don't collide) and all meal-ingredient
+        links are inserted with one executemany, instead of a round-trip per
+        ingredient as with add_ingredient_to_meal.
+
+        Args:
+            db: Database session
+            meal_id: Meal ID
+            rows: Dicts with ingredient_name and state, and optionally
+                quantity_description, confidence and source (default "user-add")
+
+        Returns:
+            Number of ingredients added
+        """
+        if not rows:
+            return 0
+
+        # Normalized name -> name to create it with (first spelling wins)
+        names = {}
+        for row in rows:
+            names.setdefault(
+                Ingredient.normalize_name(row["ingredient_name"]),
+                row["ingredient_name"],
+            )
+
+        def lookup_ids(normalized_names) -> Dict[str, int]:
+            return dict(
+                db.query(Ingredient.normalized_name, Ingredient.id)
+                .filter(Ingredient.normalized_name.in_(normalized_names))
+                .all()
+            )
+
+        ingredient_ids = lookup_ids(names)
+        missing = [name for name in names if name not in ingredient_ids]
+        if missing:
+            db.execute(
+                pg_insert(Ingredient)
+                .values([{"name": names[n], "normalized_name": n} for n in missing])
+                .on_conflict_do_nothing(index_elements=["normalized_name"])
+            )
+            ingredient_ids.update(lookup_ids(missing))
+
+        db.execute(
+            insert(MealIngredient),
+            [
+                {
+                    "meal_id": meal_id,
+                    "ingredient_id": ingredient_ids[
+                        Ingredient.normalize_name(row["ingredient_name"])
+                    ],
+                    "state": row["state"],
+                    "quantity_description": row.get("quantity_description"),
+                    "confidence": row.get("confidence"),
+                    "source": row.get("source", "user-add"),
+                }
+                for row in rows
+            ],
+        )
+        db.commit()
+        return len(rows)
+
     @staticmethod
     def remove_ingredient_from_meal(db: Session, meal_ingredient_id: int) -> bool:
         """
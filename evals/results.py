@@ -140,6 +140,27 @@ def compare_runs(run_ids: list[int]) -> dict:
         db.close()
 
 
+def _run_details_dict(run) -> dict:
+    """Serialize an EvalRun row into the full details dict."""
+    return {
+        "id": run.id,
+        "model": run.model_name,
+        "eval_type": run.eval_type,
+        "created_at": run.created_at.isoformat() if run.created_at else None,
+        "precision": float(run.precision) if run.precision else None,
+        "recall": float(run.recall) if run.recall else None,
+        "f1": float(run.f1_score) if run.f1_score else None,
+        "accuracy": float(run.accuracy) if run.accuracy else None,
+        "num_cases": run.num_test_cases,
+        "test_data_source": run.test_data_source,
+        "execution_time": float(run.execution_time_seconds)
+        if run.execution_time_seconds
+        else None,
+        "notes": run.notes,
+        "detailed_results": run.detailed_results,
+    }
+
+
 def get_run_details(run_id: int) -> dict | None:
     """Get full details for a specific eval run.
 
@@ -158,22 +179,32 @@ def get_run_details(run_id: int) -> dict | None:
         if not run:
             return None
 
-        return {
-            "id": run.id,
-            "model": run.model_name,
-            "eval_type": run.eval_type,
-            "created_at": run.created_at.isoformat() if run.created_at else None,
-            "precision": float(run.precision) if run.precision else None,
-            "recall": float(run.recall) if run.recall else None,
-            "f1": float(run.f1_score) if run.f1_score else None,
-            "accuracy": float(run.accuracy) if run.accuracy else None,
-            "num_cases": run.num_test_cases,
-            "test_data_source": run.test_data_source,
-            "execution_time": float(run.execution_time_seconds)
-            if run.execution_time_seconds
-            else None,
-            "notes": run.notes,
-            "detailed_results": run.detailed_results,
-        }
+        return _run_details_dict(run)
+    finally:
+        db.close()
+
+
+def get_runs_details(run_ids: list[int]) -> list[dict | None]:
+    """Get full details for several eval runs with a single query.
+
+    Args:
+        run_ids: Database IDs of the eval runs
+
+    Returns:
+        Full eval run data in the same order as run_ids, with None in place
+        of any ID that was not found
+    """
+    from app.database import SessionLocal
+    from app.models.eval_run import EvalRun
+
+    db = SessionLocal()
+    try:
+        runs = db.query(EvalRun).filter(EvalRun.id.in_(run_ids)).all()
+        by_id = {run.id: run for run in runs}
+
+        return [
+            _run_details_dict(by_id[run_id]) if run_id in by_id else None
+            for run_id in run_ids
+        ]
     finally:
         db.close()
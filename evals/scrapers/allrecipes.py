@@ -7,6 +7,13 @@ from bs4 import BeautifulSoup
 
 from .base import BaseScraper, ScrapedRecipe, ScrapedIngredient
 
+# Cooking state indicators, one named group per state, matched as whole words
+_STATE_RE = re.compile(
+    r"\b(?:(?P<cooked>cooked|roasted|grilled|fried|baked|steamed|sauteed)"
+    r"|(?P<processed>canned|jarred|frozen|dried|pickled|crushed))\b",
+    re.IGNORECASE,
+)
+
 
 class AllRecipesScraper(BaseScraper):
     """Scraper for AllRecipes.
@@ -180,39 +187,11 @@ class AllRecipesScraper(BaseScraper):
             "2 tablespoons olive oil" -> ScrapedIngredient(name="olive oil", quantity="2", unit="tablespoons")
             "1 cup diced onion" -> ScrapedIngredient(name="onion", quantity="1", unit="cup")
         """
-        # Common cooking state indicators
-        cooked_indicators = [
-            "cooked",
-            "roasted",
-            "grilled",
-            "fried",
-            "baked",
-            "steamed",
-            "sauteed",
-        ]
-        processed_indicators = [
-            "canned",
-            "jarred",
-            "frozen",
-            "dried",
-            "pickled",
-            "crushed",
-        ]
-
         text = text.strip()
-        state = None
 
-        # Detect state from text
-        text_lower = text.lower()
-        for indicator in cooked_indicators:
-            if indicator in text_lower:
-                state = "cooked"
-                break
-        if not state:
-            for indicator in processed_indicators:
-                if indicator in text_lower:
-                    state = "processed"
-                    break
+        # Detect state from text - one scan, cooked takes priority over processed
+        found = {m.lastgroup for m in _STATE_RE.finditer(text)}
+        state = next((k for k in ("cooked", "processed") if k in found), None)
 
         # Extract quantity and unit using regex
         # AllRecipes often uses parenthetical notes like "(8 ounce) package"
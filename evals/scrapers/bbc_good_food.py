@@ -7,6 +7,14 @@ from bs4 import BeautifulSoup
 
 from .base import BaseScraper, ScrapedRecipe, ScrapedIngredient, NutritionInfo
 
+# Cooking state indicators, one named group per state, matched as whole words
+_STATE_RE = re.compile(
+    r"\b(?:(?P<cooked>cooked|roasted|grilled|fried|baked|steamed|saut[eé]ed)"
+    r"|(?P<processed>canned|tinned|jarred|frozen|dried|pickled)"
+    r"|(?P<raw>raw|fresh|uncooked))\b",
+    re.IGNORECASE,
+)
+
 
 class BBCGoodFoodScraper(BaseScraper):
     """Scraper for BBC Good Food recipes.
@@ -278,46 +286,11 @@ class BBCGoodFoodScraper(BaseScraper):
             "2 tbsp olive oil" -> ScrapedIngredient(name="olive oil", quantity="2", unit="tbsp")
             "1 large onion, diced" -> ScrapedIngredient(name="onion", quantity="1", state="cooked")
         """
-        # Common cooking state indicators
-        raw_indicators = ["raw", "fresh", "uncooked"]
-        cooked_indicators = [
-            "cooked",
-            "roasted",
-            "grilled",
-            "fried",
-            "baked",
-            "steamed",
-            "sautéed",
-            "sauteed",
-        ]
-        processed_indicators = [
-            "canned",
-            "tinned",
-            "jarred",
-            "frozen",
-            "dried",
-            "pickled",
-        ]
-
         text = text.strip()
-        state = None
 
-        # Detect state from text
-        text_lower = text.lower()
-        for indicator in cooked_indicators:
-            if indicator in text_lower:
-                state = "cooked"
-                break
-        if not state:
-            for indicator in processed_indicators:
-                if indicator in text_lower:
-                    state = "processed"
-                    break
-        if not state:
-            for indicator in raw_indicators:
-                if indicator in text_lower:
-                    state = "raw"
-                    break
+        # Detect state from text - one scan, cooked > processed > raw priority
+        found = {m.lastgroup for m in _STATE_RE.finditer(text)}
+        state = next((k for k in ("cooked", "processed", "raw") if k in found), None)
 
         # Extract quantity and unit using regex
         # Pattern: optional number (including fractions) + optional unit
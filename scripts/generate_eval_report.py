@@ -15,36 +15,155 @@ Usage:
 
 import argparse
 import base64
-import html
+import gzip
+import json
+import mmap
+import os
+import shutil
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache, partial
+from itertools import islice
 from pathlib import Path
+from types import MappingProxyType
+from typing import Iterator, TextIO
+from urllib.parse import quote
 
-from evals.results import get_run_details
+from markupsafe import Markup, escape
 
+try:
+    import orjson
+except ImportError:  # comes with fastapi[all], but is not a direct dependency
+    orjson = None
 
-def load_image_base64(image_path: str) -> str:
-    """Load image and encode as base64 data URI."""
-    path = Path("evals/datasets") / image_path
-    if not path.exists():
-        return ""
+try:
+    # SIMD base64 encoder; optional, several times faster on large images
+    from pybase64 import b64encode_as_string as _b64encode
+except ImportError:
+
+    def _b64encode(data) -> str:
+        return base64.b64encode(data).decode("ascii")
+
+
+_DATASET_ROOT = Path("evals/datasets")
+
+# Shared read-only default for missing mappings, instead of a fresh {} per .get()
+_EMPTY = MappingProxyType({})
+
+_MIME_TYPES = {
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".png": "image/png",
+    ".webp": "image/webp",
+}
+
+
+# Bytes encoded per base64 chunk; a multiple of 3 so chunks need no padding
+_B64_CHUNK = 48 * 1024
+
+
+def open_image(image_path: str) -> mmap.mmap | bytes | None:
+    """
+    Map an image read-only and ask the kernel to start reading it in.
+
+    Returns None if the image doesn't exist (b"" for an empty file, which
+    mmap refuses to map).
+    """
+    try:
+        with open(_DATASET_ROOT / image_path, "rb") as f:
+            try:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                return b""
+    except FileNotFoundError:
+        return None
+
+    if hasattr(mmap, "MADV_WILLNEED"):
+        mm.madvise(mmap.MADV_WILLNEED)
+    return mm
 
-    suffix = path.suffix.lower()
-    mime_types = {
-        ".jpg": "image/jpeg",
-        ".jpeg": "image/jpeg",
-        ".png": "image/png",
-        ".webp": "image/webp",
-    }
-    mime_type = mime_types.get(suffix, "image/jpeg")
 
-    with open(path, "rb") as f:
-        data = base64.b64encode(f.read()).decode("utf-8")
+def link_image(image_path: str, image_dir: Path) -> str | None:
+    """
+    Copy an image next to the report and return its URL relative to the report.
+
+    Copies are skipped when an identical (same size and mtime) copy already
+    exists. Returns None if the image doesn't exist.
+    """
+    source = _DATASET_ROOT / image_path
+    dest = image_dir / image_path
+    try:
+        source_stat = source.stat()
+    except FileNotFoundError:
+        return None
+
+    try:
+        dest_stat = dest.stat()
+        up_to_date = (
+            dest_stat.st_size == source_stat.st_size
+            and dest_stat.st_mtime_ns == source_stat.st_mtime_ns
+        )
+    except FileNotFoundError:
+        up_to_date = False
+
+    if not up_to_date:
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(source, dest)
+
+    return quote(f"{image_dir.name}/{Path(image_path).as_posix()}")
+
 
-    return f"data:{mime_type};base64,{data}"
+def iter_image_data_uri(image_path: str, image: mmap.mmap | bytes) -> Iterator[str]:
+    """
+    Yield a base64 data URI for an opened image in chunks.
 
+    Only one chunk of encoded data exists at a time, so peak memory doesn't
+    grow with image size. Closes the mapping once exhausted.
+    """
+    mime_type = _MIME_TYPES.get(Path(image_path).suffix.lower(), "image/jpeg")
+    # Data URI is built locally, so skip escaping the (large) base64 payload
+    yield Markup(f"data:{mime_type};base64,")
+    try:
+        for start in range(0, len(image), _B64_CHUNK):
+            chunk = image[start : start + _B64_CHUNK]
+            yield Markup(_b64encode(chunk))
+    finally:
+        if isinstance(image, mmap.mmap):
+            image.close()
+
+
+def index_prediction_scores(ingredient_details: dict) -> tuple[dict, dict]:
+    """
+    Index a case's prediction scores once so per-ingredient lookups are O(1).
 
-def get_match_status(
-    ingredient_name: str, ingredient_details: dict
-) -> tuple[str, float, str]:
+    Returns: (by_expected, by_predicted)
+        - by_expected: expected name -> (best score, predicted name)
+        - by_predicted: predicted name -> (score, matched_to) of its first entry
+    """
+    by_expected = {}
+    by_predicted = {}
+    # Expected names that already have a full (1.0) match and can't improve
+    fully_matched = set()
+
+    for pred in ingredient_details.get("prediction_scores") or ():
+        predicted = pred["predicted"]
+        if predicted not in by_predicted:
+            by_predicted[predicted] = (pred.get("score", 0), pred.get("matched_to"))
+
+        matched_to = pred.get("matched_to")
+        if matched_to is None or matched_to in fully_matched:
+            continue
+
+        best_score = by_expected.get(matched_to, (0.0, None))[0]
+        if pred["score"] > best_score:
+            by_expected[matched_to] = (pred["score"], predicted)
+            if pred["score"] >= 1.0:
+                fully_matched.add(matched_to)
+
+    return by_expected, by_predicted
+
+
+def get_match_status(ingredient_name: str, by_expected: dict) -> tuple[str, float, str]:
     """
     Determine if an expected ingredient was matched by any prediction.
 
@@ -53,16 +172,7 @@ def get_match_status(
         - score: best match score (0, 0.5, or 1.0)
         - matched_by: name of predicted ingredient that matched
     """
-    prediction_scores = ingredient_details.get("prediction_scores", [])
-
-    best_score = 0.0
-    matched_by = None
-
-    for pred in prediction_scores:
-        if pred.get("matched_to") == ingredient_name:
-            if pred["score"] > best_score:
-                best_score = pred["score"]
-                matched_by = pred["predicted"]
+    best_score, matched_by = by_expected.get(ingredient_name, (0.0, None))
 
     if best_score >= 1.0:
         return "matched", best_score, matched_by
@@ -72,9 +182,7 @@ def get_match_status(
         return "missed", 0.0, None
 
 
-def get_prediction_status(
-    predicted: str, ingredient_details: dict
-) -> tuple[str, float, str]:
+def get_prediction_status(predicted: str, by_predicted: dict) -> tuple[str, float, str]:
     """
     Determine if a predicted ingredient matched any expected ingredient.
 
@@ -83,21 +191,27 @@ def get_prediction_status(
         - score: match score (0, 0.5, or 1.0)
         - matched_to: name of expected ingredient it matched
     """
-    prediction_scores = ingredient_details.get("prediction_scores", [])
+    if predicted not in by_predicted:
+        return "wrong", 0.0, None
 
-    for pred in prediction_scores:
-        if pred["predicted"] == predicted:
-            score = pred.get("score", 0)
-            matched_to = pred.get("matched_to")
+    score, matched_to = by_predicted[predicted]
 
-            if score >= 1.0:
-                return "correct", score, matched_to
-            elif score >= 0.5:
-                return "partial", score, matched_to
-            else:
-                return "wrong", 0.0, None
+    if score >= 1.0:
+        return "correct", score, matched_to
+    elif score >= 0.5:
+        return "partial", score, matched_to
+    else:
+        return "wrong", 0.0, None
 
-    return "wrong", 0.0, None
+
+@dataclass(slots=True)
+class CaseRecord:
+    """A test case merged across runs; versions[i] is None if run i lacks it."""
+
+    id: str
+    image_path: str
+    expected: dict
+    versions: list[dict | None]
 
 
 def get_version_label(run_data: dict) -> str:
@@ -112,23 +226,94 @@ def get_version_label(run_data: dict) -> str:
     return f"Run {run_data.get('id', '?')}"
 
 
-def generate_comparison_html(runs_data: list[dict], output_path: str) -> None:
-    """Generate HTML visualization comparing multiple eval runs."""
+def get_score_class(score: float) -> str:
+    """Map a 0-1 score to the good/medium/poor CSS class."""
+    if score >= 0.7:
+        return "good"
+    elif score >= 0.4:
+        return "medium"
+    return "poor"
+
+
+@lru_cache(maxsize=1024)
+def format_pct(value: float, digits: int = 1) -> str:
+    """Format a 0-1 value as a percentage (memoized; scores repeat a lot)."""
+    return f"{value:.{digits}%}"
+
+
+# Templates and stylesheet live in scripts/templates
+_TEMPLATE_DIR = Path(__file__).parent / "templates"
+
+
+def _orjson_dumps(obj, **kwargs) -> str:
+    return orjson.dumps(obj).decode()
+
+
+@lru_cache(maxsize=None)
+def _load_templates():
+    """
+    Compile the header, test case and footer templates (once per process).
+
+    Deferred until the first report is written, so --help and argument errors
+    don't pay for importing Jinja and compiling templates.
+    """
+    from jinja2 import Environment, FileSystemLoader
+
+    env = Environment(
+        loader=FileSystemLoader(_TEMPLATE_DIR),
+        cache_size=-1,
+        autoescape=True,
+        trim_blocks=True,
+        lstrip_blocks=True,
+        auto_reload=False,
+    )
+
+    # The stylesheet is read once and inlined in the header
+    css = (_TEMPLATE_DIR / "eval_report.css").read_text(encoding="utf-8")
+    env.globals["css"] = Markup(css)
+
+    # The embedded report data is by far the largest thing |tojson serializes:
+    # skip key sorting and whitespace, and use orjson when it is installed.
+    # Jinja still escapes <, >, & and ' in the output for safe <script> embedding.
+    if orjson is not None:
+        env.policies["json.dumps_function"] = _orjson_dumps
+        env.policies["json.dumps_kwargs"] = {}
+    else:
+        env.policies["json.dumps_function"] = json.dumps
+        env.policies["json.dumps_kwargs"] = {"separators": (",", ":")}
+
+    return (
+        env.get_template("eval_report_header.html"),
+        env.get_template("eval_report_case.html"),
+        env.get_template("eval_report_footer.html"),
+    )
+
+
+def generate_comparison_html(
+    runs_data: list[dict], output_path: str, inline_images: bool = True
+) -> None:
+    """
+    Generate HTML visualization comparing multiple eval runs.
+
+    Images are embedded as base64 data URIs by default. With inline_images=False
+    they are copied into a meal-images/ directory next to the report and linked,
+    which keeps the HTML small. An output path ending in .gz is gzip-compressed.
+    """
 
     # Build version info
     versions = []
     for run in runs_data:
         version_label = get_version_label(run)
-        aggregate = run.get("detailed_results", {}).get("aggregate", {})
+        detailed = run.get("detailed_results") or _EMPTY
+        aggregate = detailed.get("aggregate") or _EMPTY
+        created_at = run.get("created_at")
         versions.append(
             {
                 "id": run.get("id"),
                 "label": version_label,
                 "model": run.get("model", "Unknown"),
-                "created_at": run.get("created_at", "")[:10]
-                if run.get("created_at")
-                else "N/A",
-                "notes": run.get("detailed_results", {}).get("notes", ""),
+                "created_at": created_at[:10] if created_at else "N/A",
+                "notes": detailed.get("notes", ""),
                 "f1": aggregate.get("mean_f1", 0),
                 "precision": aggregate.get("mean_precision", 0),
                 "recall": aggregate.get("mean_recall", 0),
@@ -137,639 +322,249 @@ def generate_comparison_html(runs_data: list[dict], output_path: str) -> None:
             }
         )
 
-    # Collect all test cases indexed by ID
-    test_cases_by_id = {}
+    # Collect all test cases, using the ID index only while merging runs
+    cases = []
+    case_index = {}
     for run_idx, run in enumerate(runs_data):
-        test_cases = run.get("detailed_results", {}).get("test_cases", [])
-        for case in test_cases:
+        detailed = run.get("detailed_results") or _EMPTY
+        for case in detailed.get("test_cases") or ():
             case_id = case.get("id", "unknown")
-            if case_id not in test_cases_by_id:
-                test_cases_by_id[case_id] = {
-                    "id": case_id,
-                    "image_path": case.get("image_path", ""),
-                    "expected": case.get("expected", {}),
-                    "versions": {},
-                }
-            test_cases_by_id[case_id]["versions"][run_idx] = {
+            record = case_index.get(case_id)
+            if record is None:
+                record = CaseRecord(
+                    id=case_id,
+                    image_path=case.get("image_path", ""),
+                    expected=case.get("expected", {}),
+                    versions=[None] * len(runs_data),
+                )
+                case_index[case_id] = record
+                cases.append(record)
+            record.versions[run_idx] = {
                 "predicted": case.get("predicted", {}),
                 "score": case.get("score", {}),
                 "ingredient_details": case.get("ingredient_details", {}),
             }
 
     # Sort test cases by ID
-    sorted_case_ids = sorted(test_cases_by_id.keys())
-
-    def get_score_class(score):
-        if score >= 0.7:
-            return "good"
-        elif score >= 0.4:
-            return "medium"
-        return "poor"
-
-    # Start building HTML
-    html_parts = [
-        """<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Meal Analysis Eval Comparison</title>
-    <style>
-        * {
-            box-sizing: border-box;
-            margin: 0;
-            padding: 0;
-        }
-
-        body {
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-            background: #f5f5f5;
-            color: #333;
-            line-height: 1.5;
-            padding: 20px;
-        }
-
-        .container {
-            max-width: 1400px;
-            margin: 0 auto;
-        }
-
-        h1 {
-            font-size: 1.8rem;
-            margin-bottom: 10px;
-            color: #1a1a1a;
-        }
-
-        h2 {
-            font-size: 1.2rem;
-            margin-bottom: 10px;
-            color: #333;
-        }
-
-        /* Summary Section */
-        .summary {
-            background: white;
-            border-radius: 12px;
-            padding: 24px;
-            margin-bottom: 30px;
-            box-shadow: 0 2px 8px rgba(0,0,0,0.08);
-        }
-
-        /* Version Comparison Table */
-        .comparison-table {
-            width: 100%;
-            border-collapse: collapse;
-            margin: 16px 0;
-            font-size: 0.95rem;
-        }
-
-        .comparison-table th,
-        .comparison-table td {
-            padding: 12px 16px;
-            text-align: left;
-            border-bottom: 1px solid #eee;
-        }
-
-        .comparison-table th {
-            background: #f8f9fa;
-            font-weight: 600;
-            color: #555;
-            font-size: 0.85rem;
-            text-transform: uppercase;
-            letter-spacing: 0.03em;
-        }
-
-        .comparison-table tr:hover {
-            background: #f8f9fa;
-        }
-
-        .comparison-table .metric-cell {
-            font-weight: 600;
-            font-variant-numeric: tabular-nums;
-        }
-
-        .comparison-table .metric-cell.good { color: #16a34a; }
-        .comparison-table .metric-cell.medium { color: #d97706; }
-        .comparison-table .metric-cell.poor { color: #dc2626; }
-
-        .comparison-table .best {
-            background: #dcfce7;
-        }
-
-        .version-label {
-            font-weight: 600;
-            color: #1a1a1a;
-        }
-
-        .version-notes {
-            font-size: 0.85rem;
-            color: #666;
-            margin-top: 4px;
-        }
-
-        .delta {
-            font-size: 0.8rem;
-            margin-left: 6px;
-        }
-
-        .delta.positive { color: #16a34a; }
-        .delta.negative { color: #dc2626; }
-
-        /* Version Tabs */
-        .version-tabs {
-            display: flex;
-            gap: 8px;
-            flex-wrap: wrap;
-            margin-bottom: 20px;
-        }
-
-        .version-tab {
-            padding: 8px 16px;
-            border: 2px solid #e5e5e5;
-            border-radius: 8px;
-            background: white;
-            cursor: pointer;
-            font-size: 0.9rem;
-            font-weight: 500;
-            transition: all 0.15s ease;
-        }
-
-        .version-tab:hover {
-            border-color: #2563eb;
-            background: #eff6ff;
-        }
-
-        .version-tab.active {
-            border-color: #2563eb;
-            background: #2563eb;
-            color: white;
-        }
-
-        .version-tab .tab-score {
-            font-size: 0.8rem;
-            opacity: 0.8;
-            margin-left: 6px;
-        }
-
-        /* Test Case Cards */
-        .test-case {
-            background: white;
-            border-radius: 12px;
-            margin-bottom: 20px;
-            box-shadow: 0 2px 8px rgba(0,0,0,0.08);
-            overflow: hidden;
-        }
-
-        .test-case-header {
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            padding: 16px 20px;
-            background: #f8f9fa;
-            border-bottom: 1px solid #eee;
-            flex-wrap: wrap;
-            gap: 12px;
-        }
-
-        .test-case-id {
-            font-weight: 600;
-            color: #333;
-        }
-
-        .score-badges {
-            display: flex;
-            gap: 8px;
-            flex-wrap: wrap;
-        }
-
-        .score-badge {
-            display: inline-flex;
-            align-items: center;
-            gap: 4px;
-            padding: 6px 12px;
-            border-radius: 20px;
-            font-weight: 600;
-            font-size: 0.85rem;
-        }
-
-        .score-badge.good { background: #dcfce7; color: #166534; }
-        .score-badge.medium { background: #fef3c7; color: #92400e; }
-        .score-badge.poor { background: #fee2e2; color: #991b1b; }
-
-        .score-badge .version-name {
-            font-weight: 500;
-            opacity: 0.8;
-        }
-
-        .test-case-body {
-            display: grid;
-            grid-template-columns: 200px 1fr 1fr;
-            gap: 20px;
-            padding: 20px;
-        }
-
-        @media (max-width: 900px) {
-            .test-case-body {
-                grid-template-columns: 1fr;
-            }
-        }
-
-        .image-col {
-            display: flex;
-            flex-direction: column;
-            gap: 8px;
-        }
-
-        .meal-image {
-            width: 100%;
-            height: 180px;
-            object-fit: cover;
-            border-radius: 8px;
-            background: #e5e5e5;
-        }
-
-        .column-header {
-            font-size: 0.75rem;
-            font-weight: 600;
-            text-transform: uppercase;
-            letter-spacing: 0.05em;
-            color: #888;
-            margin-bottom: 8px;
-        }
-
-        .meal-title {
-            font-weight: 600;
-            font-size: 1rem;
-            margin-bottom: 12px;
-            color: #1a1a1a;
-        }
-
-        .ingredients-list {
-            list-style: none;
-        }
-
-        .ingredient {
-            padding: 4px 8px;
-            margin: 2px 0;
-            border-radius: 4px;
-            font-size: 0.9rem;
-        }
-
-        /* Ground truth colors */
-        .ingredient.matched {
-            background: #dcfce7;
-            color: #166534;
-        }
-
-        .ingredient.partial {
-            background: #fef3c7;
-            color: #92400e;
-        }
-
-        .ingredient.missed {
-            background: #fee2e2;
-            color: #991b1b;
-        }
-
-        /* Prediction colors */
-        .ingredient.correct {
-            background: #dcfce7;
-            color: #166534;
-        }
-
-        .ingredient.wrong {
-            background: #fee2e2;
-            color: #991b1b;
-        }
-
-        .match-info {
-            font-size: 0.75rem;
-            opacity: 0.8;
-        }
-
-        .legend {
-            display: flex;
-            gap: 16px;
-            flex-wrap: wrap;
-            margin-top: 12px;
-            font-size: 0.85rem;
-        }
-
-        .legend-item {
-            display: flex;
-            align-items: center;
-            gap: 6px;
-        }
-
-        .legend-swatch {
-            width: 16px;
-            height: 16px;
-            border-radius: 4px;
-        }
-
-        .legend-swatch.green { background: #dcfce7; border: 1px solid #86efac; }
-        .legend-swatch.yellow { background: #fef3c7; border: 1px solid #fcd34d; }
-        .legend-swatch.red { background: #fee2e2; border: 1px solid #fca5a5; }
-
-        /* Version content */
-        .version-content {
-            display: none;
-        }
-
-        .version-content.active {
-            display: block;
-        }
-
-        .predictions-wrapper {
-            position: relative;
-        }
-
-        .prediction-version {
-            display: none;
-        }
-
-        .prediction-version.active {
-            display: block;
-        }
-    </style>
-</head>
-<body>
-    <div class="container">
-"""
-    ]
+    cases.sort(key=lambda record: record.id)
 
-    # Find best scores for highlighting
-    best_f1 = max(v["f1"] for v in versions) if versions else 0
-    baseline_f1 = versions[0]["f1"] if versions else 0
-
-    # Summary section with comparison table
-    html_parts.append(f"""
-        <div class="summary">
-            <h1>Meal Analysis Eval Comparison</h1>
-            <p style="color: #666; margin-bottom: 16px;">
-                Comparing {len(versions)} prompt versions. Select a version below to view per-case predictions.
-            </p>
-
-            <table class="comparison-table">
-                <thead>
-                    <tr>
-                        <th>Version</th>
-                        <th>F1 Score</th>
-                        <th>Precision</th>
-                        <th>Recall</th>
-                        <th>State Acc</th>
-                        <th>Cases</th>
-                        <th>Date</th>
-                    </tr>
-                </thead>
-                <tbody>
-""")
+    # Stream the report straight to disk rather than holding it in memory
+    output = Path(output_path)
+    if output.suffix == ".gz":
+        # Level 4: most of the markup/JSON savings for a fraction of level 9's CPU
+        out_file = gzip.open(output, "wt", encoding="utf-8", compresslevel=4)
+    else:
+        out_file = open(output, "w", encoding="utf-8", buffering=1 << 20)
+    with out_file as out:
+        image_dir = None if inline_images else output.parent / "meal-images"
+        write_comparison_html(out, versions, cases, image_dir)
+    print(f"Generated comparison report: {output.absolute()}")
 
-    for i, v in enumerate(versions):
-        is_best = v["f1"] == best_f1 and len(versions) > 1
-        row_class = "best" if is_best else ""
 
-        # Calculate delta from baseline
-        delta_f1 = v["f1"] - baseline_f1 if i > 0 else 0
-        delta_html = ""
-        if i > 0:
-            delta_class = (
-                "positive" if delta_f1 > 0 else "negative" if delta_f1 < 0 else ""
-            )
-            delta_sign = "+" if delta_f1 > 0 else ""
-            delta_html = (
-                f'<span class="delta {delta_class}">{delta_sign}{delta_f1:.1%}</span>'
-            )
+def write_comparison_html(
+    out: TextIO,
+    versions: list[dict],
+    cases: list[CaseRecord],
+    image_dir: Path | None = None,
+) -> None:
+    """
+    Render the comparison report to an open text stream, one test case at a time.
 
-        notes_html = (
-            f'<div class="version-notes">{html.escape(v["notes"][:60])}...</div>'
-            if v["notes"]
-            else ""
-        )
+    Images are inlined unless image_dir is given, in which case they are copied
+    there and linked.
+    """
 
-        html_parts.append(f"""
-                    <tr class="{row_class}">
-                        <td>
-                            <div class="version-label">{html.escape(v["label"])}</div>
-                            {notes_html}
-                        </td>
-                        <td class="metric-cell {get_score_class(v["f1"])}">{v["f1"]:.1%}{delta_html}</td>
-                        <td class="metric-cell {get_score_class(v["precision"])}">{v["precision"]:.1%}</td>
-                        <td class="metric-cell {get_score_class(v["recall"])}">{v["recall"]:.1%}</td>
-                        <td class="metric-cell {get_score_class(v["state_accuracy"])}">{v["state_accuracy"]:.1%}</td>
-                        <td>{v["num_cases"]}</td>
-                        <td>{v["created_at"]}</td>
-                    </tr>
-""")
-
-    html_parts.append("""
-                </tbody>
-            </table>
-
-            <div class="legend">
-                <div class="legend-item">
-                    <div class="legend-swatch green"></div>
-                    <span>Full match (1.0)</span>
-                </div>
-                <div class="legend-item">
-                    <div class="legend-swatch yellow"></div>
-                    <span>Partial match (0.5)</span>
-                </div>
-                <div class="legend-item">
-                    <div class="legend-swatch red"></div>
-                    <span>No match / Wrong</span>
-                </div>
-            </div>
-        </div>
-""")
-
-    # Version selector tabs
-    html_parts.append("""
-        <h2>Test Cases</h2>
-        <div class="version-tabs">
-""")
+    # Find best scores for highlighting
+    best_f1 = max(v["f1"] for v in versions) if versions else 0
+    baseline_f1 = versions[0]["f1"] if versions else 0
 
+    # Derive every displayed field up front so the row template only substitutes
     for i, v in enumerate(versions):
-        active_class = "active" if i == 0 else ""
-        html_parts.append(f"""
-            <button class="version-tab {active_class}" data-version="{i}">
-                {html.escape(v["label"])}
-                <span class="tab-score">F1: {v["f1"]:.0%}</span>
-            </button>
-""")
-
-    html_parts.append("</div>")
-
-    # Test case cards
-    for case_id in sorted_case_ids:
-        case_data = test_cases_by_id[case_id]
-        image_path = case_data["image_path"]
-        expected = case_data["expected"]
-
-        # Load image
-        image_data = load_image_base64(image_path)
-
-        # Score badges for all versions
-        score_badges_html = []
-        for i, v in enumerate(versions):
-            version_data = case_data["versions"].get(i, {})
-            score = version_data.get("score", {})
-            f1 = score.get("f1", 0)
-            score_badges_html.append(
-                f'<span class="score-badge {get_score_class(f1)}" data-version="{i}">'
-                f'<span class="version-name">{html.escape(v["label"][:10])}:</span> {f1:.0%}'
-                f"</span>"
-            )
-
-        html_parts.append(f"""
-        <div class="test-case">
-            <div class="test-case-header">
-                <span class="test-case-id">{html.escape(case_id)}</span>
-                <div class="score-badges">
-                    {"".join(score_badges_html)}
-                </div>
-            </div>
-            <div class="test-case-body">
-                <div class="image-col">
-                    <div class="column-header">Image</div>
-                    {"<img class='meal-image' src='" + image_data + "' alt='Meal image'>" if image_data else "<div class='meal-image' style='display:flex;align-items:center;justify-content:center;color:#999;'>No image</div>"}
-                </div>
-                <div>
-                    <div class="column-header">Ground Truth ({len(expected.get("ingredients", []))} ingredients)</div>
-                    <div class="meal-title">{html.escape(expected.get("meal_name", "Unknown"))}</div>
-""")
-
-        # Build ground truth ingredients per version (colors change based on selected version)
-        for i, v in enumerate(versions):
-            version_data = case_data["versions"].get(i, {})
-            ingredient_details = version_data.get("ingredient_details", {})
-
-            active_class = "active" if i == 0 else ""
-
-            expected_ingredients_html = []
-            for ing in expected.get("ingredients", []):
-                ing_name = ing.get("name", "Unknown")
-                raw_text = ing.get("raw_text", ing_name)
-                required = ing.get("required", True)
+        v["row_class"] = "best" if v["f1"] == best_f1 and len(versions) > 1 else ""
+        v["metric_cells"] = [
+            {"css_class": get_score_class(v[key]), "text": format_pct(v[key])}
+            for key in ("f1", "precision", "recall", "state_accuracy")
+        ]
+
+        # Delta from baseline, shown for every version after the first
+        v["delta_class"] = ""
+        v["delta_text"] = ""
+        if i > 0:
+            delta_f1 = v["f1"] - baseline_f1
+            if delta_f1 > 0:
+                v["delta_class"] = "positive"
+                v["delta_text"] = "+" + format_pct(delta_f1)
+            else:
+                v["delta_class"] = "negative" if delta_f1 < 0 else ""
+                v["delta_text"] = format_pct(delta_f1)
+
+        # Escape/format the per-version labels once rather than once per test case
+        v["label_html"] = escape(v["label"])
+        v["short_label_html"] = escape(v["label"][:10])
+        v["f1_pct"] = format_pct(v["f1"], 0)
+
+    header_template, case_template, footer_template = _load_templates()
+    out.writelines(header_template.generate(versions=versions))
+
+    # Image path -> CSS class of the rule that already embeds it, or its URL when
+    # linking ("" if missing)
+    image_refs = {}
+    # Per-version ingredient data for each card, rendered client-side on tab switch
+    case_payloads = []
+
+    # Open and read ahead (or copy, when linking) images in the background while
+    # earlier cards are rendered. Only a bounded window is in flight;
+    # build_case_context pops each future as it is consumed and the card streams
+    # the encoded image out.
+    max_workers = min(16, (os.cpu_count() or 1) * 4)
+    window = max_workers * 2
+    pending_paths = iter(dict.fromkeys(record.image_path for record in cases))
+    load_image = (
+        open_image if image_dir is None else partial(link_image, image_dir=image_dir)
+    )
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        image_futures = {}
+
+        # Test case cards, already sorted by ID
+        for index, record in enumerate(cases):
+            for path in islice(pending_paths, window - len(image_futures)):
+                image_futures[path] = pool.submit(load_image, path)
+
+            case = build_case_context(record, versions, image_refs, image_futures)
+            case["index"] = index
+            case["image_linked"] = image_dir is not None
+            case_payloads.append(case.pop("payload"))
+            out.writelines(case_template.generate(case=case))
+
+    report_data = {"labels": [v["label"] for v in versions], "cases": case_payloads}
+    out.writelines(footer_template.generate(report_data=report_data))
+
+
+def build_case_context(
+    record: CaseRecord,
+    versions: list[dict],
+    image_refs: dict[str, str],
+    image_futures: dict[str, Future],
+) -> dict:
+    """
+    Precompute statuses and display fields for one test case card.
 
-                status, match_score, matched_by = get_match_status(
-                    ing_name, ingredient_details
-                )
+    The card markup is version independent; per-version statuses and
+    predictions are returned under "payload" for the client-side renderer.
 
-                status_class = status
-                match_info = ""
-                if matched_by and status != "missed":
-                    match_info = f' <span class="match-info">(matched by: {html.escape(matched_by)})</span>'
+    Each distinct image is embedded once, as a CSS background rule emitted with
+    the first card that uses it; later cards reuse its class via image_refs.
+    Linked images are referenced by URL from every card that uses them.
+    Opened images come from image_futures, keyed by image path; each future is
+    removed once read and its data URI is encoded lazily as the card renders.
+    """
+    expected = record.expected
+    expected_ingredients = expected.get("ingredients") or ()
+
+    # Load image only the first time its path is seen in this report
+    image_path = record.image_path
+    image_chunks = ()
+    if image_path not in image_refs:
+        image = image_futures.pop(image_path).result()
+        if image is None:
+            image_refs[image_path] = ""
+        elif isinstance(image, str):
+            image_refs[image_path] = image
+        else:
+            image_refs[image_path] = f"meal-image-{len(image_refs)}"
+            image_chunks = iter_image_data_uri(image_path, image)
+
+    # Ground truth names are the same for every version; extract them once
+    expected_names = [ing.get("name", "Unknown") for ing in expected_ingredients]
+
+    # One pass over the versions builds the score badge, ground truth statuses
+    # and predictions for each (ground truth colors depend on the version)
+    badges = []
+    payload = []
+    for version_data, v in zip(record.versions, versions):
+        version_data = version_data or _EMPTY
+        score = version_data.get("score") or _EMPTY
+        predicted = version_data.get("predicted") or _EMPTY
+        by_expected, by_predicted = index_prediction_scores(
+            version_data.get("ingredient_details") or _EMPTY
+        )
 
-                display_text = html.escape(raw_text)
-                if not required:
-                    display_text = f"<em>{display_text}</em> (optional)"
+        f1 = score.get("f1", 0)
+        badges.append(
+            {
+                "label": v["short_label_html"],
+                "css_class": get_score_class(f1),
+                "f1_text": format_pct(f1, 0),
+            }
+        )
 
-                expected_ingredients_html.append(
-                    f'<li class="ingredient {status_class}">{display_text}{match_info}</li>'
+        if by_expected:
+            expected_rows = []
+            for name in expected_names:
+                status, match_score, matched_by = get_match_status(name, by_expected)
+                expected_rows.append(
+                    [status, matched_by if status != "missed" else None]
                 )
+        else:
+            # Nothing matched any expected ingredient: all missed, skip lookups
+            expected_rows = [["missed", None] for _ in expected_names]
 
-            html_parts.append(f"""
-                    <ul class="ingredients-list prediction-version {active_class}" data-version="{i}">
-                        {"".join(expected_ingredients_html)}
-                    </ul>
-""")
-
-        html_parts.append("""
-                </div>
-                <div class="predictions-wrapper">
-""")
-
-        # Predictions for each version
-        for i, v in enumerate(versions):
-            version_data = case_data["versions"].get(i, {})
-            predicted = version_data.get("predicted", {})
-            ingredient_details = version_data.get("ingredient_details", {})
-
-            active_class = "active" if i == 0 else ""
-
-            predicted_ingredients_html = []
-            for ing in predicted.get("ingredients", []):
-                if isinstance(ing, dict):
-                    ing_name = ing.get("name", "Unknown")
-                    ing_state = ing.get("state", "")
-                else:
-                    ing_name = str(ing)
-                    ing_state = ""
+        predicted_rows = []
+        for ing in predicted.get("ingredients") or ():
+            if isinstance(ing, dict):
+                ing_name = ing.get("name", "Unknown")
+                ing_state = ing.get("state", "")
+            else:
+                ing_name = str(ing)
+                ing_state = ""
 
+            if by_predicted:
                 status, match_score, matched_to = get_prediction_status(
-                    ing_name, ingredient_details
+                    ing_name, by_predicted
                 )
+            else:
+                status, match_score, matched_to = "wrong", 0.0, None
+            predicted_rows.append(
+                [
+                    ing_name,
+                    ing_state,
+                    status,
+                    matched_to,
+                    "full" if match_score >= 1.0 else "partial",
+                ]
+            )
 
-                match_info = ""
-                if matched_to:
-                    score_str = "full" if match_score >= 1.0 else "partial"
-                    match_info = f' <span class="match-info">({score_str}: {html.escape(matched_to)})</span>'
-
-                display_text = html.escape(ing_name)
-                if ing_state:
-                    display_text += f" <em>({ing_state})</em>"
-
-                predicted_ingredients_html.append(
-                    f'<li class="ingredient {status}">{display_text}{match_info}</li>'
-                )
+        payload.append(
+            {
+                "expected": expected_rows,
+                "meal_name": predicted.get("meal_name", "Unknown"),
+                "predicted": predicted_rows,
+            }
+        )
 
-            html_parts.append(f"""
-                    <div class="prediction-version {active_class}" data-version="{i}">
-                        <div class="column-header">Predicted - {html.escape(v["label"])} ({len(predicted.get("ingredients", []))} ingredients)</div>
-                        <div class="meal-title">{html.escape(predicted.get("meal_name", "Unknown"))}</div>
-                        <ul class="ingredients-list">
-                            {"".join(predicted_ingredients_html)}
-                        </ul>
-                    </div>
-""")
-
-        html_parts.append("""
-                </div>
-            </div>
-        </div>
-""")
-
-    # JavaScript for version switching
-    html_parts.append("""
-    </div>
-
-    <script>
-        document.addEventListener('DOMContentLoaded', function() {
-            const tabs = document.querySelectorAll('.version-tab');
-
-            tabs.forEach(tab => {
-                tab.addEventListener('click', function() {
-                    const version = this.dataset.version;
-
-                    // Update tab active state
-                    tabs.forEach(t => t.classList.remove('active'));
-                    this.classList.add('active');
-
-                    // Update all version-specific content
-                    document.querySelectorAll('.prediction-version').forEach(el => {
-                        el.classList.remove('active');
-                        if (el.dataset.version === version) {
-                            el.classList.add('active');
-                        }
-                    });
-                });
-            });
-        });
-    </script>
-</body>
-</html>
-""")
-
-    # Write to file
-    output = Path(output_path)
-    output.write_text("".join(html_parts))
-    print(f"Generated comparison report: {output.absolute()}")
+    return {
+        "id": record.id,
+        "image_chunks": image_chunks,
+        "image_ref": image_refs[image_path],
+        "num_expected": len(expected_ingredients),
+        "meal_name": expected.get("meal_name", "Unknown"),
+        "badges": badges,
+        "expected_items": [
+            {
+                "text": ing.get("raw_text", ing.get("name", "Unknown")),
+                "required": ing.get("required", True),
+            }
+            for ing in expected_ingredients
+        ],
+        "payload": payload,
+    }
 
 
-def generate_single_html(run_data: dict, output_path: str) -> None:
+def generate_single_html(
+    run_data: dict, output_path: str, inline_images: bool = True
+) -> None:
     """Generate HTML visualization for a single eval run (backward compatible)."""
-    generate_comparison_html([run_data], output_path)
+    generate_comparison_html([run_data], output_path, inline_images)
 
 
 def main():
@@ -788,7 +583,13 @@ def main():
         "--output",
         type=str,
         default="evals/reports/eval_report.html",
-        help="Output HTML file path",
+        help="Output HTML file path (gzip-compressed if it ends in .gz)",
+    )
+    parser.add_argument(
+        "--inline-images",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="Embed images as base64 (default) or link copies in meal-images/",
     )
 
     args = parser.parse_args()
@@ -802,21 +603,22 @@ def main():
         print("Error: Must specify --run-id or --run-ids")
         return 1
 
+    # Imported here so --help and argument errors don't load the DB layer
+    from evals.results import get_runs_details
+
     # Load all run data
-    runs_data = []
-    for run_id in run_ids:
-        run_data = get_run_details(run_id)
+    runs_data = get_runs_details(run_ids)
+    for run_id, run_data in zip(run_ids, runs_data):
         if not run_data:
             print(f"Error: Run ID {run_id} not found")
             return 1
-        runs_data.append(run_data)
 
     # Ensure output directory exists
     output_path = Path(args.output)
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
     # Generate HTML
-    generate_comparison_html(runs_data, args.output)
+    generate_comparison_html(runs_data, args.output, args.inline_images)
     return 0
 
 
@@ -6,13 +6,17 @@ Run with: docker compose exec web python scripts/populate_dev_data.py
 """
 
 import asyncio
+import hashlib
+import json
+import os
 import bcrypt
 from datetime import datetime
+from pathlib import Path
 from zoneinfo import ZoneInfo
 
 from sqlalchemy.orm import Session
 
-from app.database import SessionLocal
+from app.database import SessionLocal, engine
 from app.models.user import User
 from app.models.meal import Meal
 from app.models.symptom import Symptom
@@ -38,6 +42,18 @@ MEAL_IMAGES = [
 # Timezone
 TZ = ZoneInfo("America/New_York")
 
+# Max AI analyses in flight at once
+AI_CONCURRENCY = 5
+
+# On-disk cache of AI analyses, keyed by image content and model, so re-runs
+# don't pay for the API again. Set BLOATY_AI_CACHE=0 to always call the API.
+AI_CACHE_DIR = Path("dev_cache/ai")
+
+# Minimum bcrypt cost: the dev password is printed below anyway, and the
+# default cost (settings.bcrypt_rounds, 12) is ~256x slower. Login verifies it
+# the same way, since the cost is stored in the hash.
+DEV_BCRYPT_ROUNDS = 4
+
 
 def create_admin_user(db: Session) -> User:
     """Create admin user if not exists."""
@@ -47,7 +63,7 @@ def create_admin_user(db: Session) -> User:
         return existing
 
     password_hash = bcrypt.hashpw(
-        "bloaty-admin".encode("utf-8"), bcrypt.gensalt()
+        "bloaty-admin".encode("utf-8"), bcrypt.gensalt(rounds=DEV_BCRYPT_ROUNDS)
     ).decode("utf-8")
 
     user = User(
@@ -56,20 +72,72 @@ def create_admin_user(db: Session) -> User:
         is_admin=True,
     )
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    db.flush()
     print(f"Created admin user: {user.id}")
     return user
 
 
-async def create_meal_with_ai_analysis(
+def load_cached_analysis(image_path: str, model: str) -> tuple[Path, dict | None]:
+    """Return the AI cache file for an image and model, and its analysis if cached.
+
+    Hashes the whole image, so callers run it in a worker thread.
+    """
+    key = hashlib.sha256(Path(image_path).read_bytes() + model.encode()).hexdigest()
+    cache_file = AI_CACHE_DIR / f"{key}.json"
+    try:
+        return cache_file, json.loads(cache_file.read_text())
+    except (FileNotFoundError, json.JSONDecodeError):
+        return cache_file, None  # Not cached yet (or corrupted), call the API
+
+
+def save_cached_analysis(cache_file: Path, analysis: dict) -> None:
+    """Write an analysis to the AI cache.
+
+    Writes a temporary file and renames it into place, so an interrupted run
+    never leaves a truncated cache file behind.
+    """
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+    try:
+        tmp_file.write_text(json.dumps(analysis))
+        os.replace(tmp_file, cache_file)
+    finally:
+        tmp_file.unlink(missing_ok=True)
+
+
+async def analyze_meal(
+    claude_service: ClaudeService, image_path: str, semaphore: asyncio.Semaphore
+) -> dict:
+    """Run one AI meal analysis, at most AI_CONCURRENCY at a time.
+
+    analyze_meal_image doesn't block the event loop, so the requests overlap.
+    Results are served from AI_CACHE_DIR when a cached analysis exists.
+    """
+    cache_file = None
+    if os.environ.get("BLOATY_AI_CACHE", "1") != "0":
+        cache_file, analysis = await asyncio.to_thread(
+            load_cached_analysis, image_path, claude_service.haiku_model
+        )
+        if analysis is not None:
+            print(f"Using cached AI analysis for {image_path}")
+            return analysis
+
+    async with semaphore:
+        analysis = await claude_service.analyze_meal_image(image_path)
+
+    if cache_file is not None:
+        await asyncio.to_thread(save_cached_analysis, cache_file, analysis)
+    return analysis
+
+
+def create_meal_with_ai_analysis(
     db: Session,
     user_id,
     image_path: str,
     timestamp: datetime,
-    claude_service: ClaudeService,
+    analysis: dict | BaseException,
 ) -> Meal:
-    """Create a meal and run AI analysis to get ingredients."""
+    """Create a meal from a finished AI analysis (or the exception it raised)."""
     # Create meal record
     meal = MealService.create_meal(
         db=db,
@@ -80,9 +148,10 @@ async def create_meal_with_ai_analysis(
     )
     print(f"Created meal {meal.id} from {image_path}")
 
-    # Run AI analysis
+    # Apply AI analysis
     try:
-        analysis = await claude_service.analyze_meal_image(image_path)
+        if isinstance(analysis, BaseException):
+            raise analysis
         meal_name = analysis.get("meal_name", "Unknown Meal")
         ingredients = analysis.get("ingredients", [])
 
@@ -91,12 +160,13 @@ async def create_meal_with_ai_analysis(
         meal.name_source = "ai"
         meal.ai_raw_response = analysis.get("raw_response")
         meal.ai_suggested_ingredients = ingredients
-        db.commit()
+        db.flush()
 
         print(f"  Meal name: {meal_name}")
         print(f"  Found {len(ingredients)} ingredients")
 
-        # Add ingredients to meal
+        # Add ingredients to meal in one batch
+        rows = []
         for ing in ingredients:
             state_str = ing.get("state", "cooked").lower()
             if state_str == "raw":
@@ -106,15 +176,16 @@ async def create_meal_with_ai_analysis(
             else:
                 state = IngredientState.COOKED
 
-            MealService.add_ingredient_to_meal(
-                db=db,
-                meal_id=meal.id,
-                ingredient_name=ing.get("name", "unknown"),
-                state=state,
-                quantity_description=ing.get("quantity"),
-                confidence=ing.get("confidence"),
-                source="ai",
+            rows.append(
+                {
+                    "ingredient_name": ing.get("name", "unknown"),
+                    "state": state,
+                    "quantity_description": ing.get("quantity"),
+                    "confidence": ing.get("confidence"),
+                    "source": "ai",
+                }
             )
+        MealService.add_ingredients_bulk(db, meal.id, rows)
 
         # Publish meal
         MealService.publish_meal(db, meal.id)
@@ -129,8 +200,7 @@ async def create_meal_with_ai_analysis(
     return meal
 
 
-def create_symptom(
-    db: Session,
+def build_symptom(
     user_id,
     timestamp: datetime,
     tags: list,
@@ -138,7 +208,7 @@ def create_symptom(
     severity: int,
     structured_type: str,
 ) -> Symptom:
-    """Create a symptom record."""
+    """Build a symptom record (added to the session in one batch by the caller)."""
     symptom = Symptom(
         user_id=user_id,
         timestamp=timestamp,
@@ -148,16 +218,16 @@ def create_symptom(
         severity=severity,
         structured_type=structured_type,
     )
-    db.add(symptom)
-    db.commit()
-    db.refresh(symptom)
-    print(f"Created symptom: {structured_type} (severity {severity}) at {timestamp}")
     return symptom
 
 
 async def main():
     """Main function to populate the database."""
-    db = SessionLocal()
+    # Populate in one outer transaction: the MealService helpers' commits only
+    # release savepoints, so Postgres commits (and fsyncs) once at the end
+    connection = engine.connect()
+    transaction = connection.begin()
+    db = SessionLocal(bind=connection, join_transaction_mode="create_savepoint")
     claude_service = ClaudeService()
 
     try:
@@ -189,10 +259,21 @@ async def main():
             (MEAL_IMAGES[9], datetime(2026, 2, 14, 19, 0, tzinfo=TZ)),  # Dinner
         ]
 
+        # Analyses are independent API round-trips, so run them concurrently;
+        # the DB writes below stay sequential on the one session
+        semaphore = asyncio.Semaphore(AI_CONCURRENCY)
+        analyses = await asyncio.gather(
+            *(
+                analyze_meal(claude_service, image_path, semaphore)
+                for image_path, _ in meal_schedule
+            ),
+            return_exceptions=True,
+        )
+
         meals = []
-        for image_path, timestamp in meal_schedule:
-            meal = await create_meal_with_ai_analysis(
-                db, user.id, image_path, timestamp, claude_service
+        for (image_path, timestamp), analysis in zip(meal_schedule, analyses):
+            meal = create_meal_with_ai_analysis(
+                db, user.id, image_path, timestamp, analysis
             )
             meals.append(meal)
 
@@ -201,80 +282,88 @@ async def main():
         # Add symptoms 2-4 hours after meals containing trigger ingredients
         print("\n=== Phase 3: Adding correlating symptoms ===")
 
-        # Symptoms after Day 1 lunch (if dairy was detected)
-        create_symptom(
-            db=db,
-            user_id=user.id,
-            timestamp=datetime(2026, 2, 12, 14, 30, tzinfo=TZ),  # 2.5 hours after lunch
-            tags=[{"name": "bloating", "severity": 6}],
-            raw_description="Feeling bloated after lunch",
-            severity=6,
-            structured_type="bloating",
-        )
-
-        # Symptoms after Day 1 dinner
-        create_symptom(
-            db=db,
-            user_id=user.id,
-            timestamp=datetime(2026, 2, 12, 22, 0, tzinfo=TZ),  # 3 hours after dinner
-            tags=[{"name": "stomach pain", "severity": 5}],
-            raw_description="Stomach discomfort after dinner",
-            severity=5,
-            structured_type="stomach pain",
-        )
-
-        # Symptoms after Day 2 lunch
-        create_symptom(
-            db=db,
-            user_id=user.id,
-            timestamp=datetime(2026, 2, 13, 15, 0, tzinfo=TZ),  # 3 hours after lunch
-            tags=[{"name": "bloating", "severity": 7}],
-            raw_description="Significant bloating after lunch",
-            severity=7,
-            structured_type="bloating",
-        )
-
-        # Symptoms after Day 2 dinner
-        create_symptom(
-            db=db,
-            user_id=user.id,
-            timestamp=datetime(2026, 2, 13, 21, 30, tzinfo=TZ),
-            tags=[{"name": "bloating", "severity": 5}, {"name": "gas", "severity": 4}],
-            raw_description="Bloating and gas after dinner",
-            severity=5,
-            structured_type="bloating",
-        )
-
-        # Symptoms after Day 3 lunch
-        create_symptom(
-            db=db,
-            user_id=user.id,
-            timestamp=datetime(2026, 2, 14, 14, 0, tzinfo=TZ),
-            tags=[{"name": "bloating", "severity": 6}],
-            raw_description="Bloating after Valentine's lunch",
-            severity=6,
-            structured_type="bloating",
-        )
+        symptoms = [
+            # Symptoms after Day 1 lunch (if dairy was detected)
+            build_symptom(
+                user_id=user.id,
+                # 2.5 hours after lunch
+                timestamp=datetime(2026, 2, 12, 14, 30, tzinfo=TZ),
+                tags=[{"name": "bloating", "severity": 6}],
+                raw_description="Feeling bloated after lunch",
+                severity=6,
+                structured_type="bloating",
+            ),
+            # Symptoms after Day 1 dinner
+            build_symptom(
+                user_id=user.id,
+                # 3 hours after dinner
+                timestamp=datetime(2026, 2, 12, 22, 0, tzinfo=TZ),
+                tags=[{"name": "stomach pain", "severity": 5}],
+                raw_description="Stomach discomfort after dinner",
+                severity=5,
+                structured_type="stomach pain",
+            ),
+            # Symptoms after Day 2 lunch
+            build_symptom(
+                user_id=user.id,
+                # 3 hours after lunch
+                timestamp=datetime(2026, 2, 13, 15, 0, tzinfo=TZ),
+                tags=[{"name": "bloating", "severity": 7}],
+                raw_description="Significant bloating after lunch",
+                severity=7,
+                structured_type="bloating",
+            ),
+            # Symptoms after Day 2 dinner
+            build_symptom(
+                user_id=user.id,
+                timestamp=datetime(2026, 2, 13, 21, 30, tzinfo=TZ),
+                tags=[
+                    {"name": "bloating", "severity": 5},
+                    {"name": "gas", "severity": 4},
+                ],
+                raw_description="Bloating and gas after dinner",
+                severity=5,
+                structured_type="bloating",
+            ),
+            # Symptoms after Day 3 lunch
+            build_symptom(
+                user_id=user.id,
+                timestamp=datetime(2026, 2, 14, 14, 0, tzinfo=TZ),
+                tags=[{"name": "bloating", "severity": 6}],
+                raw_description="Bloating after Valentine's lunch",
+                severity=6,
+                structured_type="bloating",
+            ),
+            # Delayed symptom (next day)
+            build_symptom(
+                user_id=user.id,
+                timestamp=datetime(2026, 2, 15, 8, 0, tzinfo=TZ),  # Next morning
+                tags=[{"name": "fatigue", "severity": 4}],
+                raw_description="Feeling sluggish this morning",
+                severity=4,
+                structured_type="fatigue",
+            ),
+        ]
+        db.add_all(symptoms)
+        db.flush()
+        for symptom in symptoms:
+            print(
+                f"Created symptom: {symptom.structured_type} "
+                f"(severity {symptom.severity}) at {symptom.timestamp}"
+            )
 
-        # Delayed symptom (next day)
-        create_symptom(
-            db=db,
-            user_id=user.id,
-            timestamp=datetime(2026, 2, 15, 8, 0, tzinfo=TZ),  # Next morning
-            tags=[{"name": "fatigue", "severity": 4}],
-            raw_description="Feeling sluggish this morning",
-            severity=4,
-            structured_type="fatigue",
-        )
+        transaction.commit()
 
         print("\n=== Done! ===")
-        print(f"Created {len(meals)} meals and 6 symptoms")
+        print(f"Created {len(meals)} meals and {len(symptoms)} symptoms")
         print("Login at http://localhost:8000 with:")
         print("  Email: tmaisey@gmail.com")
         print("  Password: bloaty-admin")
 
     finally:
+        claude_service.close()
         db.close()
+        connection.close()  # Rolls back if the commit above wasn't reached
 
 
 if __name__ == "__main__":
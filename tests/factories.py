@@ -7,9 +7,13 @@ Use db.flush() to get IDs without committing (for transaction rollback).
 
 from datetime import datetime, timedelta, timezone
 from typing import Optional, List, Dict, Any
+import base64
+import os
+import random
 import secrets
 
 import bcrypt
+from sqlalchemy import text
 from sqlalchemy.orm import Session
 
 from app.models import (
@@ -29,10 +33,45 @@ from app.models import (
 )
 
 
+# Session and invite tokens only need to be unique in tests, not unpredictable,
+# so they come from one urandom-seeded PRNG instead of a syscall per token
+_TOKEN_RNG = random.Random()
+
+
+def fast_token() -> str:
+    """Return a token shaped like secrets.token_urlsafe(32), for tests only."""
+    return base64.urlsafe_b64encode(_TOKEN_RNG.randbytes(32)).rstrip(b"=").decode()
+
+
 # =============================================================================
 # User Factory
 # =============================================================================
 
+# bcrypt cost for test passwords, including those the app hashes (conftest
+# applies it to settings.bcrypt_rounds). The production cost of 12 is ~256x
+# slower than the minimum of 4; set BCRYPT_TEST_ROUNDS=12 to test with it.
+BCRYPT_TEST_ROUNDS = int(os.environ.get("BCRYPT_TEST_ROUNDS", "4"))
+
+# bcrypt hashes by password. Salted hashes of the same password are
+# interchangeable for login, so each password is only hashed once per run.
+_HASH_CACHE: Dict[str, str] = {}
+
+
+def hash_password(password: str) -> str:
+    """Return a bcrypt hash of password, reusing the hash across calls."""
+    password_hash = _HASH_CACHE.get(password)
+    if password_hash is None:
+        password_hash = bcrypt.hashpw(
+            password.encode("utf-8"), bcrypt.gensalt(rounds=BCRYPT_TEST_ROUNDS)
+        ).decode("utf-8")
+        _HASH_CACHE[password] = password_hash
+    return password_hash
+
+
+# Pre-hash the passwords of the shared test users
+for _password in ("testpassword123", "adminpassword123"):
+    hash_password(_password)
+
 
 def create_user(
     db: Session,
@@ -57,13 +96,9 @@ def create_user(
     if email is None:
         email = f"testuser_{secrets.token_hex(4)}@example.com"
 
-    password_hash = bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode(
-        "utf-8"
-    )
-
     defaults = {
         "email": email.lower(),
-        "password_hash": password_hash,
+        "password_hash": hash_password(password),
         "is_admin": is_admin,
     }
     defaults.update(overrides)
@@ -103,7 +138,7 @@ def create_session(
     """
     defaults = {
         "user_id": user.id,
-        "token": secrets.token_urlsafe(32),
+        "token": fast_token(),
         "expires_at": datetime.now(timezone.utc) + expires_in,
         "user_agent": user_agent,
         "ip_address": ip_address,
@@ -146,7 +181,7 @@ def create_invite(
     now = datetime.now(timezone.utc)
 
     defaults = {
-        "token": secrets.token_urlsafe(32),
+        "token": fast_token(),
         "created_by": creator.id,
         "expires_at": now + expires_in,
         "used_at": now if used else None,
@@ -206,8 +241,7 @@ def create_ingredient(
 # =============================================================================
 
 
-def create_meal(
-    db: Session,
+def build_meal(
     user: User,
     name: Optional[str] = None,
     status: str = "published",
@@ -215,10 +249,9 @@ def create_meal(
     **overrides,
 ) -> Meal:
     """
-    Create a meal.
+    Build a meal.
 
     Args:
-        db: Database session
         user: User who owns the meal
         name: Meal name (auto-generated if not provided)
         status: 'draft' or 'published'
@@ -226,7 +259,7 @@ def create_meal(
         **overrides: Additional fields to override
 
     Returns:
-        Created Meal object
+        Unsaved Meal object
     """
     if name is None:
         name = f"Test Meal {secrets.token_hex(4)}"
@@ -243,7 +276,19 @@ def create_meal(
     }
     defaults.update(overrides)
 
-    meal = Meal(**defaults)
+    return Meal(**defaults)
+
+
+def create_meal(
+    db: Session,
+    user: User,
+    name: Optional[str] = None,
+    status: str = "published",
+    timestamp: Optional[datetime] = None,
+    **overrides,
+) -> Meal:
+    """Create a meal with build_meal and flush it."""
+    meal = build_meal(user, name, status, timestamp, **overrides)
     db.add(meal)
     db.flush()
     return meal
@@ -254,8 +299,7 @@ def create_meal(
 # =============================================================================
 
 
-def create_meal_ingredient(
-    db: Session,
+def build_meal_ingredient(
     meal: Meal,
     ingredient: Ingredient,
     state: IngredientState = IngredientState.COOKED,
@@ -265,10 +309,9 @@ def create_meal_ingredient(
     **overrides,
 ) -> MealIngredient:
     """
-    Create a meal-ingredient link.
+    Build a meal-ingredient link.
 
     Args:
-        db: Database session
         meal: Meal to link
         ingredient: Ingredient to link
         state: Ingredient state (raw, cooked, processed)
@@ -278,7 +321,7 @@ def create_meal_ingredient(
         **overrides: Additional fields to override
 
     Returns:
-        Created MealIngredient object
+        Unsaved MealIngredient object
     """
     defaults = {
         "meal_id": meal.id,
@@ -290,7 +333,23 @@ def create_meal_ingredient(
     }
     defaults.update(overrides)
 
-    meal_ingredient = MealIngredient(**defaults)
+    return MealIngredient(**defaults)
+
+
+def create_meal_ingredient(
+    db: Session,
+    meal: Meal,
+    ingredient: Ingredient,
+    state: IngredientState = IngredientState.COOKED,
+    quantity_description: Optional[str] = None,
+    confidence: Optional[float] = None,
+    source: str = "manual",
+    **overrides,
+) -> MealIngredient:
+    """Create a meal-ingredient link with build_meal_ingredient and flush it."""
+    meal_ingredient = build_meal_ingredient(
+        meal, ingredient, state, quantity_description, confidence, source, **overrides
+    )
     db.add(meal_ingredient)
     db.flush()
     return meal_ingredient
@@ -301,8 +360,7 @@ def create_meal_ingredient(
 # =============================================================================
 
 
-def create_symptom(
-    db: Session,
+def build_symptom(
     user: User,
     raw_description: Optional[str] = None,
     tags: Optional[List[Dict]] = None,
@@ -314,10 +372,9 @@ def create_symptom(
     **overrides,
 ) -> Symptom:
     """
-    Create a symptom entry.
+    Build a symptom entry.
 
     Args:
-        db: Database session
         user: User who logged the symptom
         raw_description: User's description (auto-generated if not provided)
         tags: List of {"name": str, "severity": int}
@@ -329,7 +386,7 @@ def create_symptom(
         **overrides: Additional fields to override
 
     Returns:
-        Created Symptom object
+        Unsaved Symptom object
     """
     if start_time is None:
         start_time = datetime.now(timezone.utc)
@@ -362,7 +419,33 @@ def create_symptom(
     }
     defaults.update(overrides)
 
-    symptom = Symptom(**defaults)
+    return Symptom(**defaults)
+
+
+def create_symptom(
+    db: Session,
+    user: User,
+    raw_description: Optional[str] = None,
+    tags: Optional[List[Dict]] = None,
+    structured_type: Optional[str] = None,
+    severity: Optional[int] = None,
+    start_time: Optional[datetime] = None,
+    end_time: Optional[datetime] = None,
+    episode_id: Optional[int] = None,
+    **overrides,
+) -> Symptom:
+    """Create a symptom entry with build_symptom and flush it."""
+    symptom = build_symptom(
+        user,
+        raw_description,
+        tags,
+        structured_type,
+        severity,
+        start_time,
+        end_time,
+        episode_id,
+        **overrides,
+    )
     db.add(symptom)
     db.flush()
     return symptom
@@ -657,29 +740,38 @@ def create_meal_with_ingredients(
     Returns:
         Created Meal with ingredients attached
     """
-    meal = create_meal(db, user, name=meal_name, timestamp=timestamp, **meal_overrides)
-
-    for ing_spec in ingredients:
-        # Find or create ingredient
-        name = ing_spec["name"]
-        normalized = Ingredient.normalize_name(name)
+    meal = build_meal(user, name=meal_name, timestamp=timestamp, **meal_overrides)
+    db.add(meal)
 
-        ingredient = (
-            db.query(Ingredient)
-            .filter(Ingredient.normalized_name == normalized)
-            .first()
+    # Find existing ingredients in one query, then create the missing ones
+    names = {
+        Ingredient.normalize_name(spec["name"]): spec["name"] for spec in ingredients
+    }
+    by_normalized = {
+        ingredient.normalized_name: ingredient
+        for ingredient in db.query(Ingredient).filter(
+            Ingredient.normalized_name.in_(names)
         )
+    }
+    for normalized, name in names.items():
+        if normalized not in by_normalized:
+            by_normalized[normalized] = Ingredient(
+                name=name, normalized_name=normalized
+            )
+            db.add(by_normalized[normalized])
+    db.flush()
 
-        if not ingredient:
-            ingredient = create_ingredient(db, name=name)
-
-        # Create meal-ingredient link
-        state = ing_spec.get("state", IngredientState.COOKED)
-        quantity = ing_spec.get("quantity")
-
-        create_meal_ingredient(
-            db, meal, ingredient, state=state, quantity_description=quantity
+    # Create meal-ingredient links
+    db.add_all(
+        build_meal_ingredient(
+            meal,
+            by_normalized[Ingredient.normalize_name(ing_spec["name"])],
+            state=ing_spec.get("state", IngredientState.COOKED),
+            quantity_description=ing_spec.get("quantity"),
         )
+        for ing_spec in ingredients
+    )
+    db.flush()
 
     return meal
 
@@ -709,16 +801,33 @@ def create_symptom_episode(
     if start_time is None:
         start_time = datetime.now(timezone.utc)
 
-    symptoms = []
-    prev_id = None
+    # Each symptom links to the previous one, so reserve all the IDs from the
+    # sequence up front and insert the chain in one batch instead of flushing
+    # each row to learn its ID
+    ids = (
+        db.execute(
+            text(
+                "SELECT nextval(pg_get_serial_sequence('symptoms', 'id')) "
+                "FROM generate_series(1, :n)"
+            ),
+            {"n": occurrences},
+        )
+        .scalars()
+        .all()
+    )
 
-    for i in range(occurrences):
-        time = start_time + timedelta(hours=i * hours_between)
-        symptom = create_symptom(
-            db, user, tags=tags, start_time=time, episode_id=prev_id
+    symptoms = [
+        build_symptom(
+            user,
+            tags=tags,
+            start_time=start_time + timedelta(hours=i * hours_between),
+            episode_id=ids[i - 1] if i else None,
+            id=symptom_id,
         )
-        symptoms.append(symptom)
-        prev_id = symptom.id
+        for i, symptom_id in enumerate(ids)
+    ]
+    db.add_all(symptoms)
+    db.flush()
 
     return symptoms
 
@@ -751,23 +860,31 @@ def create_test_scenario_onion_intolerance(
     for i in range(num_meals):
         # Create meal
         meal_time = base_time + timedelta(days=i, hours=i * 3 % 12 + 8)  # Vary times
-        meal = create_meal(
-            db, user, name=f"Meal with onion {i + 1}", timestamp=meal_time
+        meals.append(
+            build_meal(user, name=f"Meal with onion {i + 1}", timestamp=meal_time)
         )
-        create_meal_ingredient(db, meal, onion, state=IngredientState.RAW)
-        meals.append(meal)
 
         # Create symptom 0.5-1.5 hours later
         lag_hours = 0.5 + (i % 3) * 0.5  # Vary lag
         symptom_time = meal_time + timedelta(hours=lag_hours)
         severity = 5 + i % 5  # Vary severity 5-9
-        symptom = create_symptom(
-            db,
-            user,
-            tags=[{"name": "bloating", "severity": severity}],
-            start_time=symptom_time,
+        symptoms.append(
+            build_symptom(
+                user,
+                tags=[{"name": "bloating", "severity": severity}],
+                start_time=symptom_time,
+            )
         )
-        symptoms.append(symptom)
+
+    # Insert each table in one batch (multi-row INSERT ... RETURNING) rather
+    # than flushing every row on its own; links need the meal IDs first
+    db.add_all(meals)
+    db.add_all(symptoms)
+    db.flush()
+    db.add_all(
+        build_meal_ingredient(meal, onion, state=IngredientState.RAW) for meal in meals
+    )
+    db.flush()
 
     return {
         "meals": meals,
@@ -1,27 +1,27 @@
 """Test fixtures for Bloaty McBloatface."""
 
-from tests.fixtures.api_cache import (
-    cached_api_response,
-    clear_cache,
-    get_cached_files,
-    set_cache_enabled,
-    get_cache_enabled,
-)
-from tests.fixtures.mocks import (
-    MockClaudeService,
-    create_mock_with_error,
-    create_mock_for_meal_analysis,
-    create_mock_for_diagnosis,
-)
+import importlib
 
-__all__ = [
-    "cached_api_response",
-    "clear_cache",
-    "get_cached_files",
-    "set_cache_enabled",
-    "get_cache_enabled",
-    "MockClaudeService",
-    "create_mock_with_error",
-    "create_mock_for_meal_analysis",
-    "create_mock_for_diagnosis",
-]
+# Re-exports, imported on first access (PEP 562) so that importing one fixture
+# module (e.g. tests.fixtures.api_cache from conftest) doesn't load the others
+_EXPORTS = {
+    "cached_api_response": "tests.fixtures.api_cache",
+    "clear_cache": "tests.fixtures.api_cache",
+    "get_cached_files": "tests.fixtures.api_cache",
+    "set_cache_enabled": "tests.fixtures.api_cache",
+    "get_cache_enabled": "tests.fixtures.api_cache",
+    "MockClaudeService": "tests.fixtures.mocks",
+    "create_mock_with_error": "tests.fixtures.mocks",
+    "create_mock_for_meal_analysis": "tests.fixtures.mocks",
+    "create_mock_for_diagnosis": "tests.fixtures.mocks",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name]), name)
+    globals()[name] = value
+    return value
@@ -15,16 +15,45 @@ Usage:
 
 import hashlib
 import json
+import mmap
+import os
+import stat
+import threading
+import time
+from collections import OrderedDict
 from pathlib import Path
-from functools import wraps
-from datetime import datetime
+from functools import lru_cache, wraps
+from datetime import datetime, timezone
 from typing import Any, Callable, Optional
 import asyncio
 
+try:
+    import orjson
+except ImportError:  # comes with fastapi[all], but is not a direct dependency
+    orjson = None
+
+try:
+    # SIMD hashing; cache keys aren't security sensitive, only need to be stable
+    from blake3 import blake3 as _hasher
+except ImportError:
+    _hasher = hashlib.sha256
+
 # Cache directory
 CACHE_DIR = Path(__file__).parent / "api_responses"
 CACHE_DIR.mkdir(exist_ok=True)
 
+# Cache files are written compact; set BLOATY_CACHE_PRETTY=1 to indent them
+# for reading by hand
+_PRETTY = os.environ.get("BLOATY_CACHE_PRETTY") == "1"
+
+# Responses already read or written this process, as their JSON text, keyed by
+# cache file name (most recently used last). Each hit parses a fresh copy, so
+# callers can't mutate what later callers get.
+_MEM_CACHE: "OrderedDict[str, bytes]" = OrderedDict()
+_MEM_CACHE_SIZE = 512
+# The async wrapper does its file I/O in worker threads
+_MEM_CACHE_LOCK = threading.Lock()
+
 # Global flag for cache control (set via pytest fixtures)
 # Defaults to False for production safety - enabled via pytest fixtures
 _use_cache = False
@@ -41,6 +70,51 @@ def get_cache_enabled() -> bool:
     return _use_cache
 
 
+# Content hashes of files already hashed this process, by absolute path,
+# with the (size, mtime_ns) they were computed for
+_FILE_HASHES: dict[str, tuple[int, int, str]] = {}
+
+
+# Longer strings (prompts, descriptions) can't be paths, so aren't stat'ed
+_MAX_PATH_LENGTH = 4096
+
+
+def _hash_file(path: str | Path) -> Optional[str]:
+    """
+    Hash a file's content, reusing the last hash while its stat matches.
+
+    Returns None if path isn't a readable file, using a single stat() to
+    find out for arguments that are plain strings rather than paths.
+    """
+    if isinstance(path, str) and len(path) >= _MAX_PATH_LENGTH:
+        return None
+    key = os.path.abspath(path)
+    try:
+        st = os.stat(key)
+    except (OSError, ValueError):  # Missing, or not a valid path at all
+        return None
+    if not stat.S_ISREG(st.st_mode):
+        return None
+
+    cached = _FILE_HASHES.get(key)
+    if cached is not None and cached[:2] == (st.st_size, st.st_mtime_ns):
+        return cached[2]
+
+    try:
+        with open(key, "rb") as f:
+            if st.st_size:
+                # Hash straight from the page cache rather than copying the
+                # file into a bytes object first
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    file_hash = _hasher(mm).hexdigest()[:16]
+            else:  # Empty files can't be mapped
+                file_hash = _hasher(b"").hexdigest()[:16]
+    except OSError:
+        return None
+    _FILE_HASHES[key] = (st.st_size, st.st_mtime_ns, file_hash)
+    return file_hash
+
+
 def _generate_cache_key(func_name: str, args: tuple, kwargs: dict) -> str:
     """
     Generate a deterministic cache key from function name and arguments.
@@ -50,29 +124,26 @@ def _generate_cache_key(func_name: str, args: tuple, kwargs: dict) -> str:
     - Complex nested structures
     - Non-serializable objects (converts to string representation)
     """
-    key_parts = [func_name]
+    # Parts are fed to the hasher as they're built, ":"-separated; this hashes
+    # the same bytes as joining them first, so keys of existing cache files
+    # don't change
+    hasher = _hasher(func_name.encode())
 
     # Process args
     for arg in args:
-        if isinstance(arg, (str, Path)) and Path(arg).exists():
-            # For file paths, hash the file content
-            try:
-                with open(arg, "rb") as f:
-                    file_hash = hashlib.sha256(f.read()).hexdigest()[:16]
-                key_parts.append(f"file:{file_hash}")
-            except (IOError, PermissionError):
-                key_parts.append(str(arg))
+        # For file paths, hash the file content
+        file_hash = _hash_file(arg) if isinstance(arg, (str, Path)) else None
+        if file_hash is not None:
+            hasher.update(f":file:{file_hash}".encode())
         else:
-            key_parts.append(_serialize_value(arg))
+            hasher.update(f":{_serialize_value(arg)}".encode())
 
     # Process kwargs (sorted for determinism)
     for key in sorted(kwargs.keys()):
         value = kwargs[key]
-        key_parts.append(f"{key}={_serialize_value(value)}")
+        hasher.update(f":{key}={_serialize_value(value)}".encode())
 
-    # Generate hash
-    combined = ":".join(key_parts)
-    return hashlib.sha256(combined.encode()).hexdigest()[:16]
+    return hasher.hexdigest()[:16]
 
 
 def _serialize_value(value: Any) -> str:
@@ -88,6 +159,102 @@ def _serialize_value(value: Any) -> str:
         return str(value)
 
 
+def _json_dumps(obj: Any, indent: bool = False) -> bytes:
+    """Serialize to JSON, with orjson when it's installed (several times faster)."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, default=str, option=option)
+    if indent:
+        return json.dumps(obj, indent=2, default=str).encode()
+    return json.dumps(obj, separators=(",", ":"), default=str).encode()
+
+
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+
+def _recall(cache_file: Path) -> Optional[bytes]:
+    """Return a response's JSON from the in-memory cache, if it's there."""
+    with _MEM_CACHE_LOCK:
+        response_json = _MEM_CACHE.get(cache_file.name)
+        if response_json is not None:
+            _MEM_CACHE.move_to_end(cache_file.name)
+        return response_json
+
+
+def _remember(cache_file: Path, response_json: bytes):
+    """Keep a response in the in-memory cache, evicting the oldest if full."""
+    with _MEM_CACHE_LOCK:
+        _MEM_CACHE[cache_file.name] = response_json
+        _MEM_CACHE.move_to_end(cache_file.name)
+        if len(_MEM_CACHE) > _MEM_CACHE_SIZE:
+            _MEM_CACHE.popitem(last=False)
+
+
+def _load_cached(cache_file: Path) -> tuple[bool, Any]:
+    """Return (found, response) from memory, falling back to the cache file."""
+    response_json = _recall(cache_file)
+    if response_json is not None:
+        return True, _json_loads(response_json)
+
+    # Just try the read: a stat() first would cost a syscall on every hit, and
+    # a snapshot of the directory would miss files other workers write
+    try:
+        response = _json_loads(cache_file.read_bytes()).get("response")
+    except FileNotFoundError:
+        return False, None
+    except (ValueError, KeyError):  # orjson's JSONDecodeError is a ValueError
+        return False, None  # Cache corrupted, regenerate
+    _remember(cache_file, _json_dumps(response))
+    return True, response
+
+
+@lru_cache(maxsize=1)
+def _timestamp(second: int) -> str:
+    """Format a cache file's timestamp, once per second rather than per write."""
+    return datetime.fromtimestamp(second, tz=timezone.utc).strftime(
+        "%Y-%m-%dT%H:%M:%SZ"
+    )
+
+
+def _store_cached(cache_file: Path, func_name: str, cache_key: str, result: Any):
+    """Write a fresh response to its cache file and the in-memory cache."""
+    try:
+        response_json = _json_dumps(result)
+    except TypeError as e:
+        print(f"Warning: Could not cache response: {e}")
+        return
+
+    # Refreshing a response the API returned unchanged leaves the file alone,
+    # rather than rewriting it just to bump the timestamp
+    found, _ = _load_cached(cache_file)
+    if found and _recall(cache_file) == response_json:
+        return
+
+    cache_data = {
+        "request": {
+            "function": func_name,
+            "args_hash": cache_key,
+            "timestamp": _timestamp(int(time.time())),
+        },
+        "response": result,
+    }
+
+    # Write to a temporary file and rename it into place, so an interrupted
+    # run (or a parallel worker) never sees a half-written cache file
+    tmp_file = cache_file.with_name(
+        f"{cache_file.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+    )
+    try:
+        with open(tmp_file, "wb") as f:
+            f.write(_json_dumps(cache_data, indent=_PRETTY))
+        os.replace(tmp_file, cache_file)
+        _remember(cache_file, response_json)
+    except (IOError, TypeError) as e:
+        # Non-fatal: just don't cache
+        tmp_file.unlink(missing_ok=True)
+        print(f"Warning: Could not cache response: {e}")
+
+
 def cached_api_response(func: Callable) -> Callable:
     """
     Decorator that caches API responses for test replay.
@@ -110,31 +277,23 @@ def cached_api_response(func: Callable) -> Callable:
         cache_key = _generate_cache_key(func.__name__, args, kwargs)
         cache_file = CACHE_DIR / f"{func.__name__}_{cache_key}.json"
 
-        if should_use_cache and cache_file.exists():
-            try:
-                data = json.loads(cache_file.read_text())
-                return data.get("response")
-            except (json.JSONDecodeError, KeyError):
-                pass  # Cache corrupted, regenerate
+        # Memory hits are served inline; file I/O runs in a worker thread so
+        # it doesn't block other coroutines on the event loop
+        if should_use_cache:
+            response_json = _recall(cache_file)
+            if response_json is not None:
+                return _json_loads(response_json)
+            found, response = await asyncio.to_thread(_load_cached, cache_file)
+            if found:
+                return response
 
         # Make actual API call
         result = await func(*args, **kwargs)
 
         # Cache the response
-        cache_data = {
-            "request": {
-                "function": func.__name__,
-                "args_hash": cache_key,
-                "timestamp": datetime.utcnow().isoformat() + "Z",
-            },
-            "response": result,
-        }
-
-        try:
-            cache_file.write_text(json.dumps(cache_data, indent=2, default=str))
-        except (IOError, TypeError) as e:
-            # Non-fatal: just don't cache
-            print(f"Warning: Could not cache response: {e}")
+        await asyncio.to_thread(
+            _store_cached, cache_file, func.__name__, cache_key, result
+        )
 
         return result
 
@@ -146,30 +305,16 @@ def cached_api_response(func: Callable) -> Callable:
         cache_key = _generate_cache_key(func.__name__, args, kwargs)
         cache_file = CACHE_DIR / f"{func.__name__}_{cache_key}.json"
 
-        if should_use_cache and cache_file.exists():
-            try:
-                data = json.loads(cache_file.read_text())
-                return data.get("response")
-            except (json.JSONDecodeError, KeyError):
-                pass
+        if should_use_cache:
+            found, response = _load_cached(cache_file)
+            if found:
+                return response
 
         # Make actual API call
         result = func(*args, **kwargs)
 
         # Cache the response
-        cache_data = {
-            "request": {
-                "function": func.__name__,
-                "args_hash": cache_key,
-                "timestamp": datetime.utcnow().isoformat() + "Z",
-            },
-            "response": result,
-        }
-
-        try:
-            cache_file.write_text(json.dumps(cache_data, indent=2, default=str))
-        except (IOError, TypeError):
-            pass
+        _store_cached(cache_file, func.__name__, cache_key, result)
 
         return result
 
@@ -180,6 +325,17 @@ def cached_api_response(func: Callable) -> Callable:
         return sync_wrapper
 
 
+def _scan_cache_dir(func_name: Optional[str] = None) -> list[str]:
+    """List cache file paths, matching names with plain string checks."""
+    prefix = f"{func_name}_" if func_name else ""
+    with os.scandir(CACHE_DIR) as entries:
+        return [
+            entry.path
+            for entry in entries
+            if entry.name.endswith(".json") and entry.name.startswith(prefix)
+        ]
+
+
 def clear_cache(func_name: Optional[str] = None):
     """
     Clear cached responses.
@@ -188,14 +344,16 @@ def clear_cache(func_name: Optional[str] = None):
         func_name: If provided, only clear cache for this function.
                    If None, clear all cached responses.
     """
-    if func_name:
-        pattern = f"{func_name}_*.json"
-    else:
-        pattern = "*.json"
+    with _MEM_CACHE_LOCK:
+        if func_name:
+            for name in [n for n in _MEM_CACHE if n.startswith(f"{func_name}_")]:
+                del _MEM_CACHE[name]
+        else:
+            _MEM_CACHE.clear()
 
-    for cache_file in CACHE_DIR.glob(pattern):
+    for path in _scan_cache_dir(func_name):
         try:
-            cache_file.unlink()
+            os.unlink(path)
         except OSError:
             pass
 
@@ -210,9 +368,4 @@ def get_cached_files(func_name: Optional[str] = None) -> list[Path]:
     Returns:
         List of cache file paths.
     """
-    if func_name:
-        pattern = f"{func_name}_*.json"
-    else:
-        pattern = "*.json"
-
-    return list(CACHE_DIR.glob(pattern))
+    return [Path(path) for path in _scan_cache_dir(func_name)]
@@ -16,24 +16,26 @@ def create_test_data():
     db = SessionLocal()
 
     try:
-        # Get or create ingredients
-        onion = db.query(Ingredient).filter_by(normalized_name="onion").first()
-        if not onion:
-            onion = Ingredient(name="Onion", normalized_name="onion")
-            db.add(onion)
-            db.flush()
-
-        milk = db.query(Ingredient).filter_by(normalized_name="milk").first()
-        if not milk:
-            milk = Ingredient(name="Milk", normalized_name="milk")
-            db.add(milk)
-            db.flush()
-
-        chicken = db.query(Ingredient).filter_by(normalized_name="chicken").first()
-        if not chicken:
-            chicken = Ingredient(name="Chicken", normalized_name="chicken")
-            db.add(chicken)
+        # Get or create ingredients, looking them all up in one query
+        names = {"onion": "Onion", "milk": "Milk", "chicken": "Chicken"}
+        ingredients = {
+            ingredient.normalized_name: ingredient
+            for ingredient in db.query(Ingredient).filter(
+                Ingredient.normalized_name.in_(names)
+            )
+        }
+        missing = [
+            Ingredient(name=name, normalized_name=normalized)
+            for normalized, name in names.items()
+            if normalized not in ingredients
+        ]
+        if missing:
+            db.add_all(missing)
             db.flush()
+            ingredients.update((i.normalized_name, i) for i in missing)
+        onion = ingredients["onion"]
+        milk = ingredients["milk"]
+        chicken = ingredients["chicken"]
 
         print(f"Ingredients: onion={onion.id}, milk={milk.id}, chicken={chicken.id}")
 
@@ -82,35 +84,6 @@ def create_test_data():
             },
         ]
 
-        for meal_data in onion_meals:
-            meal = Meal(
-                user_id=MVP_USER_ID,
-                timestamp=meal_data["timestamp"],
-                name=meal_data["name"],
-                status="published",
-            )
-            db.add(meal)
-            db.flush()
-
-            meal_ing = MealIngredient(
-                meal_id=meal.id,
-                ingredient_id=onion.id,
-                state=IngredientState.RAW,
-            )
-            db.add(meal_ing)
-
-            symptom = Symptom(
-                user_id=MVP_USER_ID,
-                start_time=meal_data["symptom_time"],
-                raw_description="Bloating",
-                tags=meal_data["symptom_tags"],
-            )
-            db.add(symptom)
-
-            print(
-                f"Created onion meal {meal.id} at {meal.timestamp} with symptom at {symptom.start_time}"
-            )
-
         # SCENARIO 2: Milk intolerance (delayed reactions 6-14 hours)
         # 5 meals with processed milk, each followed by gas/cramping
 
@@ -163,35 +136,6 @@ def create_test_data():
             },
         ]
 
-        for meal_data in milk_meals:
-            meal = Meal(
-                user_id=MVP_USER_ID,
-                timestamp=meal_data["timestamp"],
-                name=meal_data["name"],
-                status="published",
-            )
-            db.add(meal)
-            db.flush()
-
-            meal_ing = MealIngredient(
-                meal_id=meal.id,
-                ingredient_id=milk.id,
-                state=IngredientState.PROCESSED,
-            )
-            db.add(meal_ing)
-
-            symptom = Symptom(
-                user_id=MVP_USER_ID,
-                start_time=meal_data["symptom_time"],
-                raw_description="Bloating",
-                tags=meal_data["symptom_tags"],
-            )
-            db.add(symptom)
-
-            print(
-                f"Created milk meal {meal.id} at {meal.timestamp} with symptom at {symptom.start_time}"
-            )
-
         # SCENARIO 3: Chicken (CONTROL - no symptoms)
         # 3 meals with cooked chicken, no symptoms follow
 
@@ -210,25 +154,56 @@ def create_test_data():
             },
         ]
 
-        for meal_data in chicken_meals:
-            meal = Meal(
-                user_id=MVP_USER_ID,
-                timestamp=meal_data["timestamp"],
-                name=meal_data["name"],
-                status="published",
+        # Insert every meal in one batch, then add their ingredient links and
+        # symptoms, which are sent with the commit
+        scenarios = [
+            ("onion", onion_meals, onion, IngredientState.RAW),
+            ("milk", milk_meals, milk, IngredientState.PROCESSED),
+            ("chicken", chicken_meals, chicken, IngredientState.COOKED),
+        ]
+        meals = [
+            (
+                label,
+                meal_data,
+                ingredient,
+                state,
+                Meal(
+                    user_id=MVP_USER_ID,
+                    timestamp=meal_data["timestamp"],
+                    name=meal_data["name"],
+                    status="published",
+                ),
             )
-            db.add(meal)
-            db.flush()
+            for label, scenario_meals, ingredient, state in scenarios
+            for meal_data in scenario_meals
+        ]
+        db.add_all(meal for *_, meal in meals)
+        db.flush()
 
+        for label, meal_data, ingredient, state, meal in meals:
             meal_ing = MealIngredient(
                 meal_id=meal.id,
-                ingredient_id=chicken.id,
-                state=IngredientState.COOKED,
+                ingredient_id=ingredient.id,
+                state=state,
             )
             db.add(meal_ing)
 
+            if "symptom_time" not in meal_data:
+                print(
+                    f"Created {label} meal {meal.id} at {meal.timestamp} (control - no symptom)"
+                )
+                continue
+
+            symptom = Symptom(
+                user_id=MVP_USER_ID,
+                start_time=meal_data["symptom_time"],
+                raw_description="Bloating",
+                tags=meal_data["symptom_tags"],
+            )
+            db.add(symptom)
+
             print(
-                f"Created chicken meal {meal.id} at {meal.timestamp} (control - no symptom)"
+                f"Created {label} meal {meal.id} at {meal.timestamp} with symptom at {symptom.start_time}"
             )
 
         db.commit()
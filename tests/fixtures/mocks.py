@@ -4,8 +4,79 @@ Mock services for testing AI functionality.
 These mocks provide deterministic responses for testing without API calls.
 """
 
+import copy
+import itertools
+from collections import defaultdict
+from functools import lru_cache
 from datetime import datetime
-from typing import Any, Dict, List, Optional, AsyncIterator
+from typing import Any, AsyncIterator, DefaultDict, Dict, List, Optional
+
+# Default responses. Methods return a deep copy, since the mock is shared by
+# every test and callers (e.g. the meals route) keep the nested lists; "model"
+# is filled in per instance.
+_DEFAULT_MEAL_RESPONSE = {
+    "meal_name": "Test Meal",
+    "ingredients": [
+        {
+            "name": "chicken breast",
+            "state": "cooked",
+            "quantity": "150g",
+            "confidence": 0.92,
+        },
+        {
+            "name": "rice",
+            "state": "cooked",
+            "quantity": "1 cup",
+            "confidence": 0.88,
+        },
+        {
+            "name": "broccoli",
+            "state": "cooked",
+            "quantity": "1/2 cup",
+            "confidence": 0.85,
+        },
+    ],
+    "raw_response": "{}",
+    "model": None,
+}
+
+_DEFAULT_CORRELATIONS_SUMMARY = {
+    "overall_summary": "Analysis complete. Potential triggers identified.",
+    "caveats": [
+        "This analysis is based on correlation, not causation.",
+        "Consult a healthcare professional for diagnosis.",
+    ],
+    "usage_stats": {
+        "input_tokens": 1500,
+        "cached_tokens": 0,
+        "cache_hit": False,
+    },
+}
+
+_CLARIFY_QUESTIONS = (
+    "When did you first notice the symptoms?",
+    "How severe would you rate the symptoms on a scale of 1-10?",
+    "Did you notice any triggers?",
+)
+
+_DEFAULT_PATTERN_ANALYSIS = {
+    "analysis": (
+        "## Pattern Analysis\n\n"
+        "Based on the meal and symptom data:\n\n"
+        "- Potential correlation identified\n"
+        "- Recommend further investigation\n"
+    ),
+    "model": None,
+    "cache_hit": False,
+    "input_tokens": 2000,
+    "cached_tokens": 0,
+}
+
+
+@lru_cache(maxsize=64)
+def _chunk_text(text: str, size: int) -> tuple[str, ...]:
+    """Split text into streaming chunks, once per distinct text."""
+    return tuple(text[i : i + size] for i in range(0, len(text), size))
 
 
 class MockClaudeService:
@@ -16,13 +87,32 @@ class MockClaudeService:
     Configure responses per-test by setting attributes on the mock instance.
     """
 
+    # Recorded calls are ordered by a sequence number; set this to also record
+    # a wall-clock timestamp with each one
+    RECORD_WALLCLOCK = False
+
+    # Characters per chunk yielded by the streaming methods
+    STREAM_CHUNK_SIZE = 20
+
     def __init__(self):
         # Default model names
         self.haiku_model = "claude-3-haiku-20240307"
         self.sonnet_model = "claude-sonnet-4-5-20250929"
 
+        self.reset()
+
+    def _record_call(self, method: str, **kwargs):
+        """Record a method call for assertion."""
+        call = {"seq": next(self._seq), "kwargs": kwargs}
+        if self.RECORD_WALLCLOCK:
+            call["timestamp"] = datetime.utcnow().isoformat()
+        self.calls[method].append(call)
+
+    def reset(self):
+        """Reset all recorded calls and responses."""
         # Track method calls for assertions
-        self.calls: Dict[str, List[Dict]] = {}
+        self.calls: DefaultDict[str, List[Dict]] = defaultdict(list)
+        self._seq = itertools.count()
 
         # Configurable responses (set per test)
         self._validate_meal_image_response = True
@@ -36,23 +126,17 @@ class MockClaudeService:
         # Error simulation
         self._raise_error: Optional[Exception] = None
 
-    def _record_call(self, method: str, **kwargs):
-        """Record a method call for assertion."""
-        if method not in self.calls:
-            self.calls[method] = []
-        self.calls[method].append(
-            {"timestamp": datetime.utcnow().isoformat(), "kwargs": kwargs}
-        )
-
-    def reset(self):
-        """Reset all recorded calls and responses."""
-        self.calls = {}
-        self._raise_error = None
-
     def set_error(self, error: Exception):
         """Set an error to raise on next call."""
         self._raise_error = error
 
+    def _raise_pending_error(self):
+        """Raise (and clear) the error set by set_error(), if any."""
+        if self._raise_error:
+            error = self._raise_error
+            self._raise_error = None
+            raise error
+
     # =========================================================================
     # Meal Image Analysis
     # =========================================================================
@@ -61,10 +145,7 @@ class MockClaudeService:
         """Mock image validation."""
         self._record_call("validate_meal_image", image_path=image_path)
 
-        if self._raise_error:
-            error = self._raise_error
-            self._raise_error = None
-            raise error
+        self._raise_pending_error()
 
         return self._validate_meal_image_response
 
@@ -80,40 +161,15 @@ class MockClaudeService:
             "analyze_meal_image", image_path=image_path, user_notes=user_notes
         )
 
-        if self._raise_error:
-            error = self._raise_error
-            self._raise_error = None
-            raise error
+        self._raise_pending_error()
 
         if self._analyze_meal_image_response is not None:
             return self._analyze_meal_image_response
 
         # Default response
-        return {
-            "meal_name": "Test Meal",
-            "ingredients": [
-                {
-                    "name": "chicken breast",
-                    "state": "cooked",
-                    "quantity": "150g",
-                    "confidence": 0.92,
-                },
-                {
-                    "name": "rice",
-                    "state": "cooked",
-                    "quantity": "1 cup",
-                    "confidence": 0.88,
-                },
-                {
-                    "name": "broccoli",
-                    "state": "cooked",
-                    "quantity": "1/2 cup",
-                    "confidence": 0.85,
-                },
-            ],
-            "raw_response": "{}",
-            "model": self.haiku_model,
-        }
+        response = copy.deepcopy(_DEFAULT_MEAL_RESPONSE)
+        response["model"] = self.haiku_model
+        return response
 
     def set_analyze_meal_image_response(self, response: Dict):
         """Configure analyze_meal_image response."""
@@ -139,10 +195,7 @@ class MockClaudeService:
             user_notes=user_notes,
         )
 
-        if self._raise_error:
-            error = self._raise_error
-            self._raise_error = None
-            raise error
+        self._raise_pending_error()
 
         if self._elaborate_symptom_tags_response is not None:
             return self._elaborate_symptom_tags_response
@@ -184,10 +237,7 @@ class MockClaudeService:
             user_notes=user_notes,
         )
 
-        if self._raise_error:
-            error = self._raise_error
-            self._raise_error = None
-            raise error
+        self._raise_pending_error()
 
         # Get response (use non-streaming method's response)
         response = await self.elaborate_symptom_tags(
@@ -195,10 +245,10 @@ class MockClaudeService:
         )
 
         # Yield chunks
-        text = response.get("elaboration", "")
-        chunk_size = 20
-        for i in range(0, len(text), chunk_size):
-            yield text[i : i + chunk_size]
+        for chunk in _chunk_text(
+            response.get("elaboration", ""), self.STREAM_CHUNK_SIZE
+        ):
+            yield chunk
 
     async def detect_episode_continuation(
         self, current_tags: list, current_time: datetime, previous_symptom: dict
@@ -211,20 +261,18 @@ class MockClaudeService:
             previous_symptom=previous_symptom,
         )
 
-        if self._raise_error:
-            error = self._raise_error
-            self._raise_error = None
-            raise error
+        self._raise_pending_error()
 
         if self._detect_episode_continuation_response is not None:
             return self._detect_episode_continuation_response
 
         # Default: check if same symptom types within reasonable time
-        current_names = {t.get("name", "").lower() for t in current_tags}
         prev_tags = previous_symptom.get("tags", [])
         prev_names = {t.get("name", "").lower() for t in prev_tags}
 
-        is_continuation = bool(current_names & prev_names)
+        is_continuation = any(
+            t.get("name", "").lower() in prev_names for t in current_tags
+        )
 
         return {
             "is_continuation": is_continuation,
@@ -250,10 +298,7 @@ class MockClaudeService:
             current_symptom=current_symptom,
         )
 
-        if self._raise_error:
-            error = self._raise_error
-            self._raise_error = None
-            raise error
+        self._raise_pending_error()
 
         # Simple logic: same symptom name = ongoing
         prev_name = previous_symptom.get("name", "").lower()
@@ -282,10 +327,7 @@ class MockClaudeService:
             web_search_enabled=web_search_enabled,
         )
 
-        if self._raise_error:
-            error = self._raise_error
-            self._raise_error = None
-            raise error
+        self._raise_pending_error()
 
         if self._diagnose_correlations_response is not None:
             return self._diagnose_correlations_response
@@ -323,16 +365,7 @@ class MockClaudeService:
 
         return {
             "ingredient_analyses": analyses,
-            "overall_summary": "Analysis complete. Potential triggers identified.",
-            "caveats": [
-                "This analysis is based on correlation, not causation.",
-                "Consult a healthcare professional for diagnosis.",
-            ],
-            "usage_stats": {
-                "input_tokens": 1500,
-                "cached_tokens": 0,
-                "cache_hit": False,
-            },
+            **copy.deepcopy(_DEFAULT_CORRELATIONS_SUMMARY),
         }
 
     def set_diagnose_correlations_response(self, response: Dict):
@@ -353,10 +386,7 @@ class MockClaudeService:
             web_search_enabled=web_search_enabled,
         )
 
-        if self._raise_error:
-            error = self._raise_error
-            self._raise_error = None
-            raise error
+        self._raise_pending_error()
 
         if self._diagnose_single_ingredient_response is not None:
             return self._diagnose_single_ingredient_response
@@ -413,10 +443,7 @@ class MockClaudeService:
             web_search_enabled=web_search_enabled,
         )
 
-        if self._raise_error:
-            error = self._raise_error
-            self._raise_error = None
-            raise error
+        self._raise_pending_error()
 
         if self._classify_root_cause_response is not None:
             return self._classify_root_cause_response
@@ -463,10 +490,7 @@ class MockClaudeService:
             clarification_history=clarification_history,
         )
 
-        if self._raise_error:
-            error = self._raise_error
-            self._raise_error = None
-            raise error
+        self._raise_pending_error()
 
         # Count questions asked
         history = clarification_history or []
@@ -474,14 +498,9 @@ class MockClaudeService:
 
         if num_questions < 2:
             # Ask another question
-            questions = [
-                "When did you first notice the symptoms?",
-                "How severe would you rate the symptoms on a scale of 1-10?",
-                "Did you notice any triggers?",
-            ]
             return {
                 "mode": "question",
-                "question": questions[num_questions % len(questions)],
+                "question": _CLARIFY_QUESTIONS[num_questions % len(_CLARIFY_QUESTIONS)],
             }
         else:
             # Complete with structured data
@@ -512,23 +531,11 @@ class MockClaudeService:
             analysis_question=analysis_question,
         )
 
-        if self._raise_error:
-            error = self._raise_error
-            self._raise_error = None
-            raise error
+        self._raise_pending_error()
 
-        return {
-            "analysis": (
-                "## Pattern Analysis\n\n"
-                "Based on the meal and symptom data:\n\n"
-                "- Potential correlation identified\n"
-                "- Recommend further investigation\n"
-            ),
-            "model": self.sonnet_model,
-            "cache_hit": False,
-            "input_tokens": 2000,
-            "cached_tokens": 0,
-        }
+        response = copy.deepcopy(_DEFAULT_PATTERN_ANALYSIS)
+        response["model"] = self.sonnet_model
+        return response
 
 
 # Helper functions for common test scenarios
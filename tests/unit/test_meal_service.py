@@ -154,6 +154,71 @@ class TestMealIngredients:
         assert float(meal_ingredient.confidence) == pytest.approx(0.92, abs=0.01)
         assert meal_ingredient.source == "ai"
 
+    def test_add_ingredients_bulk(self, db: Session):
+        """Test bulk adding creates new ingredients and reuses existing ones."""
+        user = create_user(db)
+        meal = create_meal(db, user)
+        unique_name = f"Chicken_{secrets.token_hex(4)}"
+        existing = create_ingredient(db, name=unique_name)
+        new_name = f"Rice {secrets.token_hex(4)}"
+
+        added = MealService.add_ingredients_bulk(
+            db,
+            meal.id,
+            [
+                {"ingredient_name": unique_name.lower(), "state": IngredientState.RAW},
+                {
+                    "ingredient_name": new_name,
+                    "state": IngredientState.COOKED,
+                    "quantity_description": "1 cup",
+                    "confidence": 0.8,
+                    "source": "ai",
+                },
+            ],
+        )
+
+        assert added == 2
+        meal_ingredients = (
+            db.query(MealIngredient)
+            .filter(MealIngredient.meal_id == meal.id)
+            .order_by(MealIngredient.id)
+            .all()
+        )
+        assert meal_ingredients[0].ingredient_id == existing.id
+        assert meal_ingredients[1].ingredient.normalized_name == (
+            Ingredient.normalize_name(new_name)
+        )
+        assert meal_ingredients[1].quantity_description == "1 cup"
+        assert meal_ingredients[1].source == "ai"
+
+    def test_add_ingredients_bulk_shares_new_ingredient(self, db: Session):
+        """Test that repeated names in one batch create a single ingredient."""
+        user = create_user(db)
+        meal = create_meal(db, user)
+        name = f"Basil {secrets.token_hex(4)}"
+
+        MealService.add_ingredients_bulk(
+            db,
+            meal.id,
+            [
+                {"ingredient_name": name, "state": IngredientState.RAW},
+                {"ingredient_name": name.upper(), "state": IngredientState.COOKED},
+            ],
+        )
+
+        meal_ingredients = (
+            db.query(MealIngredient).filter(MealIngredient.meal_id == meal.id).all()
+        )
+        assert len(meal_ingredients) == 2
+        assert meal_ingredients[0].ingredient_id == meal_ingredients[1].ingredient_id
+
+    def test_add_ingredients_bulk_empty(self, db: Session):
+        """Test that an empty batch adds nothing."""
+        user = create_user(db)
+        meal = create_meal(db, user)
+
+        assert MealService.add_ingredients_bulk(db, meal.id, []) == 0
+
     def test_remove_ingredient(self, db: Session):
         """Test removing an ingredient from a meal."""
         user = create_user(db)
@@ -0,0 +1,61 @@
+"""
+Unit tests for the eval recipe scrapers' ingredient parsing.
+
+Tests cooking state detection, which must match state words as whole words
+and prefer cooked > processed > raw when several appear.
+"""
+
+import pytest
+
+from evals.scrapers.allrecipes import AllRecipesScraper
+from evals.scrapers.bbc_good_food import BBCGoodFoodScraper
+
+
+class TestBBCGoodFoodIngredientState:
+    """Tests for BBCGoodFoodScraper._parse_ingredient_text state detection."""
+
+    @pytest.fixture
+    def scraper(self, tmp_path):
+        return BBCGoodFoodScraper(output_dir=tmp_path)
+
+    @pytest.mark.parametrize(
+        "text, state",
+        [
+            ("200g cooked rice", "cooked"),
+            ("1 tin chopped tomatoes, tinned", "processed"),
+            ("1 raw onion", "raw"),
+            ("100g uncooked pasta", "raw"),
+            ("fresh basil, roasted", "cooked"),
+        ],
+    )
+    def test_detects_state(self, scraper, text, state):
+        """Test that state words are detected with cooked > processed > raw."""
+        assert scraper._parse_ingredient_text(text).state == state
+
+    @pytest.mark.parametrize(
+        "text", ["400g strawberries", "1 tbsp drawn butter", "2 refreshed leaves"]
+    )
+    def test_ignores_state_words_inside_other_words(self, scraper, text):
+        """Test that e.g. 'raw' inside 'strawberries' isn't tagged raw."""
+        assert scraper._parse_ingredient_text(text).state is None
+
+
+class TestAllRecipesIngredientState:
+    """Tests for AllRecipesScraper._parse_ingredient_text state detection."""
+
+    @pytest.fixture
+    def scraper(self, tmp_path):
+        return AllRecipesScraper(output_dir=tmp_path)
+
+    @pytest.mark.parametrize(
+        "text, state",
+        [
+            ("1 cup cooked chicken", "cooked"),
+            ("1 (15 ounce) can crushed tomatoes", "processed"),
+            ("2 cups strawberries", None),
+            ("1 pound unfried tofu", None),
+        ],
+    )
+    def test_detects_whole_word_state(self, scraper, text, state):
+        """Test that only whole state words set the state."""
+        assert scraper._parse_ingredient_text(text).state == state